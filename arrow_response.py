@@ -0,0 +1,70 @@
+import numpy as np
+import orjson
+import pyarrow as pa
+from fastapi.responses import Response
+from indexes import TermRecords
+
+# --- ARROW IPC RESPONSES ---
+# Programmatic clients can ask /compare for an Arrow IPC stream instead of
+# JSON (Accept: application/vnd.apache.arrow.stream). The GO comparison and
+# symbol lists come back as record batches in one long table:
+#   section - 'go_comparison' or 'gene_symbols'
+#   key     - the list within that section (e.g. 'shared', 'up_regulated')
+#   id      - GO ID or gene symbol
+#   term    - GO term name (null for symbols)
+# built straight from the interned code arrays and packed term strings, with
+# no per-row dicts. The summary is JSON in the schema metadata under 'summary'.
+#   pyarrow.ipc.open_stream(response.content).read_all()
+
+ARROW_STREAM_TYPE = "application/vnd.apache.arrow.stream"
+
+SECTIONS = ('go_comparison', 'gene_symbols')
+KEYS = ('unique_to_up_regulated', 'shared', 'unique_to_down_regulated', 'up_regulated', 'down_regulated')
+
+SCHEMA = pa.schema([
+    ('section', pa.dictionary(pa.int8(), pa.string())),
+    ('key', pa.dictionary(pa.int8(), pa.string())),
+    ('id', pa.string()),
+    ('term', pa.large_string()),
+])
+
+def accepts_arrow(accept_header):
+    return ARROW_STREAM_TYPE in (accept_header or '')
+
+def _labels(values, label, n):
+    return pa.DictionaryArray.from_arrays(pa.array(np.full(n, values.index(label), dtype=np.int8)), values)
+
+def _batch(section, key, ids, terms):
+    n = len(ids)
+    return pa.record_batch([_labels(SECTIONS, section, n), _labels(KEYS, key, n), ids, terms], schema=SCHEMA)
+
+def _term_batch(key, records):
+    if not isinstance(records, TermRecords):
+        # Plain {'id', 'term'} records, as the SQL backend returns
+        return _batch('go_comparison', key, pa.array([record['id'] for record in records], type=pa.string()),
+                      pa.array([record['term'] for record in records], type=pa.large_string()))
+    go_term_index = records.go_term_index
+    ids = pa.array(go_term_index.go_ids[records.go_codes], type=pa.string())
+    names = go_term_index.terms.take_packed(records.go_codes)
+    terms = pa.LargeStringArray.from_buffers(len(records), pa.py_buffer(names.offsets), pa.py_buffer(names.data))
+    return _batch('go_comparison', key, ids, terms)
+
+def _symbol_batch(key, symbols):
+    return _batch('gene_symbols', key, pa.array(symbols, type=pa.string()), pa.nulls(len(symbols), pa.large_string()))
+
+def encode_arrow(result):
+    schema = SCHEMA.with_metadata({'summary': orjson.dumps(result['summary'])})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for key, records in result['go_comparison'].items():
+            writer.write_batch(_term_batch(key, records))
+        for key, symbols in result['gene_symbols'].items():
+            writer.write_batch(_symbol_batch(key, symbols))
+    return sink.getvalue().to_pybytes()
+
+
+class ArrowStreamResponse(Response):
+    media_type = ARROW_STREAM_TYPE
+
+    def render(self, content):
+        return encode_arrow(content)
@@ -0,0 +1,45 @@
+import itertools
+import time
+from fastapi.testclient import TestClient
+from benchmarks.synthetic import make_tables, sample_gene_list
+import main
+from result_cache import ResultCache
+from admission import AdmissionControl
+from reference import ReferenceData
+
+# --- BENCHMARK: BATCH /compare THROUGHPUT ---
+# An experiment with K sample groups submits every ordered pair of groups as an
+# up/down contrast. Times N separate POST /compare calls against one POST
+# /compare/batch carrying the same contrasts, through the full FastAPI stack
+# (request parsing, kernel and JSON encoding). Run from the repo root:
+#   python -m benchmarks.bench_batch_compare
+
+N_GROUPS = [4, 8]
+LIST_SIZE = 1_000
+
+if __name__ == "__main__":
+    main.reference = ReferenceData.build(*make_tables())
+    # The larger batches exceed the default per-request cost limit
+    main.admission = AdmissionControl(max_cost=10**9, heavy_cost=10**9)
+    # Every request must reach the kernel, or the batch would be timed on cache hits
+    main.result_cache = ResultCache(max_entries=0)
+    # No `with`: the lifespan (database load) is skipped, the indexes are set above
+    client = TestClient(main.app)
+
+    print(f"{'contrasts':>10} {'separate/s':>12} {'batch/s':>12} {'speedup':>9}")
+    for n_groups in N_GROUPS:
+        groups = [sample_gene_list(LIST_SIZE, seed=seed) for seed in range(n_groups)]
+        payloads = [{'up_regulated': a, 'down_regulated': b, 'enrichment': True}
+                    for a, b in itertools.permutations(groups, 2)]
+
+        start = time.perf_counter()
+        separate = [client.post('/compare', json=payload).json() for payload in payloads]
+        separate_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = client.post('/compare/batch', json=payloads).json()
+        batch_s = time.perf_counter() - start
+
+        assert batch == separate
+        n = len(payloads)
+        print(f"{n:>10} {n / separate_s:>12.1f} {n / batch_s:>12.1f} {separate_s / batch_s:>8.1f}x")
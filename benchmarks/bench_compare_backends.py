@@ -0,0 +1,55 @@
+import os
+import tempfile
+import time
+from sqlalchemy import create_engine, text
+from benchmarks.synthetic import make_tables, sample_gene_list
+from comparison_backends import InMemoryBackend, SqlBackend
+from fast_json import encode
+from reference import ReferenceData
+
+# --- BENCHMARK: IN-MEMORY VS SQL COMPARISON BACKEND ---
+# Loads the synthetic reference tables into a database, then times /compare's
+# two engines on the same up/down lists of 10, 1k and 20k genes and checks they
+# agree on the summary, GO comparison and symbols. BENCH_DATABASE_URL points it
+# at a local Postgres (the tables there are replaced); without it a temporary
+# SQLite file is used, which exercises the same query shape. Run from the repo root:
+#   python -m benchmarks.bench_compare_backends
+
+REPEATS = 5
+LIST_SIZES = [10, 1_000, 20_000]
+INDEXES = {'genes': 'ensembl_gene_id', 'go_terms': '"GO_ID"', 'ensembl_to_go': 'ensembl_gene_id'}
+
+def time_call(fn, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+def load_database(engine, tables):
+    for name, df in zip(('genes', 'go_terms', 'ensembl_to_go'), tables):
+        df.to_sql(name, engine, if_exists='replace', index=False, chunksize=50_000)
+    with engine.begin() as conn:
+        for table, column in INDEXES.items():
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS bench_{table}_idx ON {table} ({column})"))
+
+def comparable(result):
+    return {section: result[section] for section in ('summary', 'go_comparison', 'gene_symbols')}
+
+if __name__ == "__main__":
+    tables = make_tables()
+    database_url = os.environ.get("BENCH_DATABASE_URL")
+    if not database_url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(database_url)
+    load_database(engine, tables)
+
+    backends = [InMemoryBackend(ReferenceData.build(*tables)), SqlBackend(engine)]
+    print(f"database: {engine.dialect.name}")
+    print(f"{'genes':>8} {'memory ms':>11} {'sql ms':>9} {'ratio':>8}")
+    for n in LIST_SIZES:
+        ids_a = set(sample_gene_list(n, seed=1))
+        ids_b = set(sample_gene_list(n, seed=2))
+        memory, sql = (encode(comparable(backend.compare(ids_a, ids_b))) for backend in backends)
+        assert memory == sql, f"backends disagree for {n} genes"
+        memory_ms, sql_ms = (time_call(lambda: encode(backend.compare(ids_a, ids_b))) for backend in backends)
+        print(f"{n:>8} {memory_ms:>11.2f} {sql_ms:>9.2f} {sql_ms / memory_ms:>7.1f}x")
@@ -0,0 +1,54 @@
+import time
+from benchmarks.synthetic import make_tables, sample_gene_list
+from comparison import compare_gene_sets
+from reference import ReferenceData
+
+# --- BENCHMARK: PER-REQUEST /compare LATENCY ---
+# Times the original DataFrame-filtering implementation of /compare against the
+# index-backed kernel for up/down lists of 10, 1k and 20k genes. Run from the
+# repo root:
+#   python -m benchmarks.bench_compare_latency
+
+REPEATS = 5
+LIST_SIZES = [10, 1_000, 20_000]
+
+def pandas_compare(ensembl_ids_a, ensembl_ids_b, gene_info_df, go_terms_map_df, ensembl_to_go_df):
+    # The per-request pandas path /compare used before the startup indexes
+    db_ensembl_ids = set(gene_info_df['ensembl_gene_id'].dropna())
+    mapped_a_count = len(ensembl_ids_a.intersection(db_ensembl_ids))
+    mapped_b_count = len(ensembl_ids_b.intersection(db_ensembl_ids))
+
+    go_set_a = set(ensembl_to_go_df[ensembl_to_go_df['ensembl_gene_id'].isin(ensembl_ids_a)]['go_id'])
+    go_set_b = set(ensembl_to_go_df[ensembl_to_go_df['ensembl_gene_id'].isin(ensembl_ids_b)]['go_id'])
+
+    def get_terms_from_ids(id_list):
+        if not id_list: return []
+        terms = go_terms_map_df[go_terms_map_df['GO_ID'].isin(id_list)]
+        return terms.rename(columns={'GO_ID': 'id', 'GO_Term': 'term'}).to_dict('records')
+
+    symbols_a = set(gene_info_df[gene_info_df['ensembl_gene_id'].isin(ensembl_ids_a)]['gene_symbol'])
+    symbols_b = set(gene_info_df[gene_info_df['ensembl_gene_id'].isin(ensembl_ids_b)]['gene_symbol'])
+    return (mapped_a_count, mapped_b_count,
+            get_terms_from_ids(list(go_set_a - go_set_b)),
+            get_terms_from_ids(list(go_set_b - go_set_a)),
+            get_terms_from_ids(list(go_set_a & go_set_b)),
+            symbols_a, symbols_b)
+
+def time_call(fn, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+if __name__ == "__main__":
+    gene_info_df, go_terms_map_df, ensembl_to_go_df = make_tables()
+    reference = ReferenceData.build(gene_info_df, go_terms_map_df, ensembl_to_go_df)
+
+    print(f"{'genes':>8} {'pandas ms':>12} {'index ms':>12} {'speedup':>9}")
+    for n in LIST_SIZES:
+        ids_a = set(sample_gene_list(n, seed=1))
+        ids_b = set(sample_gene_list(n, seed=2))
+        tables = (gene_info_df, go_terms_map_df, ensembl_to_go_df)
+        pandas_ms = time_call(lambda: pandas_compare(ids_a, ids_b, *tables))
+        index_ms = time_call(lambda: compare_gene_sets(ids_a, ids_b, reference))
+        print(f"{n:>8} {pandas_ms:>12.2f} {index_ms:>12.2f} {pandas_ms / index_ms:>8.1f}x")
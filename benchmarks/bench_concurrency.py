@@ -0,0 +1,65 @@
+import asyncio
+import time
+import httpx
+import numpy as np
+from benchmarks.synthetic import make_tables, sample_gene_list
+import main
+from compute_pool import ComputePool
+from reference import ReferenceData
+from result_cache import ResultCache
+
+# --- BENCHMARK: SMALL-REQUEST LATENCY UNDER LOAD ---
+# Keeps LARGE_IN_FLIGHT large /compare requests running continuously while
+# sending small ones (10 genes each, alternating with GET /) one at a time, and
+# reports p50/p99 latency of the small requests:
+#   inline - the comparison runs on the event loop (COMPARE_WORKERS=0)
+#   pool   - the comparison runs on the bounded worker pool
+# Requests go through the ASGI app in-process, so the client shares the event
+# loop with the server just as other connections would. Run from the repo root:
+#   python -m benchmarks.bench_concurrency
+
+LARGE_IN_FLIGHT = 2
+LARGE_LIST_SIZE = 20_000
+SMALL_REQUESTS = 100
+
+async def measure(pool):
+    main.compute_pool = pool
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
+        stop = asyncio.Event()
+
+        async def large_requests(seed):
+            payload = {'up_regulated': sample_gene_list(LARGE_LIST_SIZE, seed=seed),
+                       'down_regulated': sample_gene_list(LARGE_LIST_SIZE, seed=seed + 1), 'propagate': True}
+            while not stop.is_set():
+                await client.post('/compare', json=payload)
+                # The in-process transport may never suspend; let other requests in
+                await asyncio.sleep(0)
+
+        background = [asyncio.create_task(large_requests(2 * i)) for i in range(LARGE_IN_FLIGHT)]
+        await asyncio.sleep(0.5)
+
+        latencies = []
+        for i in range(SMALL_REQUESTS):
+            start = time.perf_counter()
+            if i % 2:
+                await client.get('/')
+            else:
+                await client.post('/compare', json={'up_regulated': sample_gene_list(10, seed=100 + i),
+                                                    'down_regulated': sample_gene_list(10, seed=200 + i)})
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        stop.set()
+        await asyncio.gather(*background)
+    pool.shutdown()
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+if __name__ == "__main__":
+    main.reference = ReferenceData.build(*make_tables())
+    # Every request must reach the kernel
+    main.result_cache = ResultCache(max_entries=0)
+
+    print(f"{'mode':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for mode, pool in (('inline', ComputePool(workers=0)), ('pool', ComputePool(workers=4, queue_depth=64))):
+        p50, p99 = asyncio.run(measure(pool))
+        print(f"{mode:>8} {p50:>9.2f} {p99:>9.2f}")
@@ -0,0 +1,39 @@
+import time
+from benchmarks.synthetic import make_tables, sample_gene_list
+from indexes import GeneGoIndex
+
+# --- MICROBENCHMARK: GENE -> GO LOOKUP ---
+# Compares the pandas `isin` scan /compare used to run per request against the
+# CSR index built once at startup. Run from the repo root:
+#   python -m benchmarks.bench_gene_go_index
+
+REPEATS = 20
+LIST_SIZES = [10, 100, 1_000, 10_000]
+
+def time_call(fn, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+def pandas_go_set(ensembl_to_go_df, ensembl_ids):
+    go = ensembl_to_go_df[ensembl_to_go_df['ensembl_gene_id'].isin(ensembl_ids)]
+    return set(go['go_id'])
+
+def index_go_set(index, ensembl_ids):
+    return set(index.go_ids_for(ensembl_ids).tolist())
+
+if __name__ == "__main__":
+    _, _, ensembl_to_go_df = make_tables()
+
+    start = time.perf_counter()
+    index = GeneGoIndex.from_frame(ensembl_to_go_df)
+    print(f"Index build: {time.perf_counter() - start:.2f}s for {len(ensembl_to_go_df)} rows")
+
+    print(f"{'genes':>8} {'pandas ms':>12} {'index ms':>12} {'speedup':>9}")
+    for n in LIST_SIZES:
+        ids = set(sample_gene_list(n))
+        assert pandas_go_set(ensembl_to_go_df, ids) == index_go_set(index, ids)
+        pandas_ms = time_call(lambda: pandas_go_set(ensembl_to_go_df, ids))
+        index_ms = time_call(lambda: index_go_set(index, ids))
+        print(f"{n:>8} {pandas_ms:>12.3f} {index_ms:>12.3f} {pandas_ms / index_ms:>8.1f}x")
@@ -0,0 +1,54 @@
+import time
+import numpy as np
+from benchmarks.synthetic import make_tables, sample_gene_list
+from indexes import GeneGoIndex, codes_mask, gather_csr, sorted_unique
+
+# --- MICROBENCHMARK: GO SET ALGEBRA ---
+# Times the three /compare set operations (a - b, b - a, a & b), starting from
+# each list's gathered GO codes, for three GO set representations:
+#   python sets  - sets of GO ID strings, as /compare originally did
+#   sorted codes - sorted unique code arrays with np.setdiff1d / np.intersect1d
+#   bitsets      - boolean arrays over the GO axis, what /compare uses now
+# Run from the repo root:
+#   python -m benchmarks.bench_go_set_algebra
+
+REPEATS = 20
+LIST_SIZES = [100, 1_000, 10_000, 20_000]
+
+def time_call(fn, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+def python_sets(go_ids, go_codes_a, go_codes_b):
+    go_set_a = set(go_ids[go_codes_a].tolist())
+    go_set_b = set(go_ids[go_codes_b].tolist())
+    return go_set_a - go_set_b, go_set_b - go_set_a, go_set_a & go_set_b
+
+def sorted_codes(go_ids, go_codes_a, go_codes_b):
+    go_codes_a, go_codes_b = sorted_unique(go_codes_a), sorted_unique(go_codes_b)
+    return (np.setdiff1d(go_codes_a, go_codes_b, assume_unique=True),
+            np.setdiff1d(go_codes_b, go_codes_a, assume_unique=True),
+            np.intersect1d(go_codes_a, go_codes_b, assume_unique=True))
+
+def bitsets(go_ids, go_codes_a, go_codes_b):
+    go_mask_a = codes_mask(go_codes_a, len(go_ids))
+    go_mask_b = codes_mask(go_codes_b, len(go_ids))
+    return (np.flatnonzero(go_mask_a & ~go_mask_b), np.flatnonzero(go_mask_b & ~go_mask_a),
+            np.flatnonzero(go_mask_a & go_mask_b))
+
+if __name__ == "__main__":
+    _, _, ensembl_to_go_df = make_tables()
+    index = GeneGoIndex.from_frame(ensembl_to_go_df)
+
+    print(f"{'genes':>8} {'sets ms':>10} {'codes ms':>10} {'bitset ms':>10}")
+    for n in LIST_SIZES:
+        # Every representation starts from the same CSR gather of each list's terms
+        go_codes_a = gather_csr(index.offsets, index.indices, index.lookup_genes(sample_gene_list(n, seed=1)))
+        go_codes_b = gather_csr(index.offsets, index.indices, index.lookup_genes(sample_gene_list(n, seed=2)))
+        expected = [set(index.go_ids[codes].tolist()) for codes in bitsets(index.go_ids, go_codes_a, go_codes_b)]
+        assert list(python_sets(index.go_ids, go_codes_a, go_codes_b)) == expected
+        timings = [time_call(lambda: fn(index.go_ids, go_codes_a, go_codes_b))
+                   for fn in (python_sets, sorted_codes, bitsets)]
+        print(f"{n:>8} " + " ".join(f"{ms:>10.3f}" for ms in timings))
@@ -0,0 +1,45 @@
+import json
+import time
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from benchmarks.synthetic import make_tables, sample_gene_list
+from comparison import compare_gene_sets
+from fast_json import FastJSONResponse
+from reference import ReferenceData
+
+# --- BENCHMARK: /compare RESPONSE SERIALIZATION ---
+# Times turning one /compare result into response bytes:
+#   default - FastAPI's path: build plain record dicts, jsonable_encoder, then
+#             JSONResponse (json.dumps)
+#   fast    - FastJSONResponse: orjson, with GO term arrays spliced in from the
+#             fragments pre-encoded at startup
+# for results of roughly 2k, 20k and 30k GO term records. Run from the repo root:
+#   python -m benchmarks.bench_json_response
+
+REPEATS = 10
+LIST_SIZES = [300, 6_000, 20_000]
+
+def time_call(fn, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+def with_plain_records(result):
+    # The dict-of-lists shape /compare returned before the fast path
+    return {**result, "go_comparison": {name: list(records)
+                                        for name, records in result["go_comparison"].items()}}
+
+if __name__ == "__main__":
+    reference = ReferenceData.build(*make_tables())
+
+    print(f"{'genes':>8} {'GO terms':>9} {'default ms':>11} {'fast ms':>9} {'speedup':>9}")
+    for n in LIST_SIZES:
+        result = compare_gene_sets(set(sample_gene_list(n, seed=1)), set(sample_gene_list(n, seed=2)), reference)
+        n_terms = sum(len(records) for records in result["go_comparison"].values())
+        plain = with_plain_records(result)
+
+        assert json.loads(FastJSONResponse(result).body) == json.loads(JSONResponse(jsonable_encoder(plain)).body)
+        default_ms = time_call(lambda: JSONResponse(jsonable_encoder(with_plain_records(result))).body)
+        fast_ms = time_call(lambda: FastJSONResponse(result).body)
+        print(f"{n:>8} {n_terms:>9} {default_ms:>11.2f} {fast_ms:>9.2f} {default_ms / fast_ms:>8.1f}x")
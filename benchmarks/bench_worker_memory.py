@@ -0,0 +1,68 @@
+import multiprocessing
+import tempfile
+from benchmarks.synthetic import make_tables, sample_gene_list
+from comparison import compare_gene_sets
+from data_plane import attach_data_plane, write_data_plane
+from reference import ReferenceData
+
+# --- BENCHMARK: RESIDENT MEMORY PER WORKER ---
+# Starts N worker processes the way `uvicorn --workers N` would and reports each
+# one's RSS and PSS (proportional set size, which splits shared pages between
+# the processes mapping them) after serving one request:
+#   before - every worker loads the tables and builds its own indexes
+#   after  - workers attach to a data plane written once by a loader process
+# Run from the repo root (Linux only, reads /proc):
+#   python -m benchmarks.bench_worker_memory
+
+N_WORKERS = 4
+
+def memory_mb():
+    with open('/proc/self/smaps_rollup') as f:
+        # First line is the address-range header of the rollup
+        fields = dict(line.split(':', 1) for line in f.readlines()[1:])
+    return int(fields['Rss'].split()[0]) / 1024, int(fields['Pss'].split()[0]) / 1024
+
+def serve_one_request(reference):
+    ids_a = set(sample_gene_list(2_000, seed=1))
+    ids_b = set(sample_gene_list(2_000, seed=2))
+    compare_gene_sets(ids_a, ids_b, reference)
+
+def loading_worker(results, barrier):
+    tables = make_tables()
+    reference = ReferenceData.build(*tables)
+    serve_one_request(reference)
+    barrier.wait()
+    results.put(memory_mb())
+    barrier.wait()
+
+def attached_worker(plane_root, results, barrier):
+    reference, _ = attach_data_plane(plane_root)
+    serve_one_request(reference)
+    barrier.wait()
+    results.put(memory_mb())
+    barrier.wait()
+
+def run(target, args):
+    results = multiprocessing.Queue()
+    barrier = multiprocessing.Barrier(N_WORKERS)
+    workers = [multiprocessing.Process(target=target, args=(*args, results, barrier)) for _ in range(N_WORKERS)]
+    for worker in workers:
+        worker.start()
+    # Measure while every worker is still alive so shared pages are split N ways
+    samples = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return samples
+
+def report(label, samples):
+    rss = sum(s[0] for s in samples) / len(samples)
+    pss = sum(s[1] for s in samples) / len(samples)
+    print(f"{label:<8} RSS/worker {rss:8.1f} MB   PSS/worker {pss:8.1f} MB   PSS total {pss * len(samples):8.1f} MB")
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method('spawn')
+    report('before', run(loading_worker, ()))
+
+    with tempfile.TemporaryDirectory() as plane_root:
+        write_data_plane(plane_root, ReferenceData.build(*make_tables()))
+        report('after', run(attached_worker, (plane_root,)))
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# --- SYNTHETIC REFERENCE DATA ---
+# Shapes roughly follow the production tables (about 60k genes, 45k GO terms and
+# a few hundred thousand gene -> GO annotations) so benchmarks can run offline.
+
+N_GENES = 60_000
+N_GO_TERMS = 45_000
+N_ANNOTATIONS = 500_000
+
+def ensembl_id(i):
+    return f"ENSG{i:011d}"
+
+def go_id(i):
+    return f"GO:{i:07d}"
+
+def make_tables(n_genes=N_GENES, n_go_terms=N_GO_TERMS, n_annotations=N_ANNOTATIONS, seed=0):
+    rng = np.random.default_rng(seed)
+    gene_ids = np.array([ensembl_id(i) for i in range(n_genes)])
+    go_ids = np.array([go_id(i) for i in range(n_go_terms)])
+
+    # Every 10th gene shares an alias with its neighbour, so some aliases are ambiguous
+    gene_info_df = pd.DataFrame({
+        'ensembl_gene_id': gene_ids,
+        'gene_symbol': [f"GENE{i}" for i in range(n_genes)],
+        'entrezgene_id': np.arange(1, n_genes + 1),
+        'gene_synonyms': [f"OLDGENE{i}|SHARED{i // 2}" if i % 10 < 2 else f"OLDGENE{i}" for i in range(n_genes)],
+    })
+    go_terms_map_df = pd.DataFrame({
+        'GO_ID': go_ids,
+        'GO_Term': [f"synthetic biological process {i}" for i in range(n_go_terms)],
+    })
+    # Skewed term popularity, like real GO annotations
+    term_weights = 1.0 / np.arange(1, n_go_terms + 1)
+    term_weights /= term_weights.sum()
+    ensembl_to_go_df = pd.DataFrame({
+        'ensembl_gene_id': gene_ids[rng.integers(0, n_genes, n_annotations)],
+        'go_id': go_ids[rng.choice(n_go_terms, n_annotations, p=term_weights)],
+    })
+    return gene_info_df, go_terms_map_df, ensembl_to_go_df
+
+def sample_gene_list(n, n_genes=N_GENES, seed=1):
+    rng = np.random.default_rng(seed)
+    return [ensembl_id(i) for i in rng.choice(n_genes, size=min(n, n_genes), replace=False)]
+
+def make_go_parents(n_go_terms=N_GO_TERMS, seed=0):
+    # Random DAG shaped like GO: a shallow, wide hierarchy where every term but
+    # the root has a parent about one level up, and ~40% have a second parent
+    rng = np.random.default_rng(seed)
+    children = np.arange(1, n_go_terms)
+    first = children // 4
+    second = np.clip(first + rng.integers(-3, 4, size=len(children)), 0, children - 1)
+    has_second = rng.random(len(children)) < 0.4
+    all_children = np.concatenate([children, children[has_second]])
+    all_parents = np.concatenate([first, second[has_second]])
+    relation = np.where(rng.random(len(all_children)) < 0.85, 'is_a', 'part_of')
+    return pd.DataFrame({
+        'go_id': [go_id(i) for i in all_children],
+        'parent_go_id': [go_id(i) for i in all_parents],
+        'relation': relation,
+    }).drop_duplicates(subset=['go_id', 'parent_go_id'])
+
+def write_obo(path, n_go_terms=47_000, seed=0):
+    # A go-basic.obo look-alike: header, [Term] stanzas carrying the usual tags
+    # (def, synonyms, xrefs, is_a, relationships), some obsolete, then [Typedef]s
+    rng = np.random.default_rng(seed)
+    go_parents = make_go_parents(n_go_terms, seed)
+    parents_by_term = go_parents.groupby('go_id')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("format-version: 1.2\ndata-version: releases/synthetic\nontology: go\n\n")
+        for i in range(n_go_terms):
+            term = go_id(i)
+            f.write(f"[Term]\nid: {term}\nname: synthetic biological process {i}\n"
+                    f"namespace: biological_process\n"
+                    f"def: \"A synthetic process used for benchmarking.\" [GOC:bench]\n"
+                    f"synonym: \"synthetic process {i}\" EXACT []\n"
+                    f"xref: Reactome:R-HSA-{i}\n")
+            if rng.random() < 0.08:
+                f.write("is_obsolete: true\n\n")
+                continue
+            if term in parents_by_term.groups:
+                for _, edge in parents_by_term.get_group(term).iterrows():
+                    if edge['relation'] == 'is_a':
+                        f.write(f"is_a: {edge['parent_go_id']} ! parent term\n")
+                    else:
+                        f.write(f"relationship: part_of {edge['parent_go_id']} ! parent term\n")
+            f.write("\n")
+        for typedef in ('ends_during', 'has_part', 'part_of', 'regulates'):
+            f.write(f"[Typedef]\nid: {typedef}\nname: {typedef.replace('_', ' ')}\n"
+                    f"namespace: external\nis_transitive: true\n\n")
+
+def make_biogrid(n_genes=N_GENES, n_interactions=800_000, seed=0):
+    # filtered_biogrid.tsv look-alike keyed by the synthetic gene symbols, with
+    # hub-heavy degrees and a few interactors that match no gene
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, n_genes + 1) ** 0.7
+    weights /= weights.sum()
+    genes_a = rng.choice(n_genes + 50, n_interactions, p=np.append(weights * 0.999, np.full(50, 0.001 / 50)))
+    genes_b = rng.choice(n_genes, n_interactions, p=weights)
+    return pd.DataFrame({
+        'Official Symbol Interactor A': [f"GENE{i}" for i in genes_a],
+        'Official Symbol Interactor B': [f"GENE{i}" for i in genes_b],
+    })
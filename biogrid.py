@@ -0,0 +1,67 @@
+import glob
+import os
+import re
+import zipfile
+from contextlib import contextmanager
+import pandas as pd
+
+# --- STREAMING BIOGRID FILTER ---
+# Keeps physical interactions from a BioGRID tab3 organism release without
+# loading the file: rows are read in chunks, only the columns downstream steps
+# use are parsed, and kept rows are appended to the output as they are found.
+# Plain, .gz and .zip releases are accepted and the newest version on disk wins.
+
+BIOGRID_COLUMNS = {
+    '#BioGRID Interaction ID': 'int64',
+    'Entrez Gene Interactor A': 'string',
+    'Entrez Gene Interactor B': 'string',
+    'Official Symbol Interactor A': 'string',
+    'Official Symbol Interactor B': 'string',
+    'Experimental System': 'category',
+    'Experimental System Type': 'category',
+}
+CHUNK_ROWS = 250_000
+
+# BIOGRID-ORGANISM-Homo_sapiens-5.0.250.tab3.txt(.gz), or the all-organism
+# BIOGRID-ORGANISM-5.0.250.tab3.zip that contains it
+RELEASE_PATTERN = re.compile(r'BIOGRID-ORGANISM-(?:Homo_sapiens-)?(\d+(?:\.\d+)*)\.tab3\.(txt|txt\.gz|zip)$')
+MEMBER_PATTERN = re.compile(r'BIOGRID-ORGANISM-Homo_sapiens-[\d.]+\.tab3\.txt$')
+
+def find_biogrid_release(raw_dir):
+    """Return ``(path, version)`` of the newest BioGRID human release in ``raw_dir``, or None."""
+    releases = []
+    for path in glob.glob(os.path.join(raw_dir, 'BIOGRID-ORGANISM-*.tab3.*')):
+        match = RELEASE_PATTERN.search(os.path.basename(path))
+        if match:
+            releases.append((tuple(int(part) for part in match.group(1).split('.')), match.group(1), path))
+    if not releases:
+        return None
+    _, version, path = max(releases)
+    return path, version
+
+@contextmanager
+def open_release(path):
+    """Yield ``(binary file, compression)`` for a release; the zip archive, if any, is closed with it."""
+    if path.endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            members = [name for name in archive.namelist() if MEMBER_PATTERN.search(name)]
+            if not members:
+                raise FileNotFoundError(f"No Homo sapiens tab3 file inside {path}")
+            with archive.open(members[0]) as source:
+                yield source, None
+        return
+    with open(path, 'rb') as source:
+        yield source, 'gzip' if path.endswith('.gz') else None
+
+def filter_biogrid(path, output_path, system_type='physical', chunk_rows=CHUNK_ROWS):
+    """Write the ``system_type`` interactions of ``path`` to ``output_path``; returns ``(kept, total)`` rows."""
+    kept = total = 0
+    with open_release(path) as (source, compression), open(output_path, 'w', newline='', encoding='utf-8') as out:
+        chunks = pd.read_csv(source, sep='\t', compression=compression, usecols=list(BIOGRID_COLUMNS),
+                             dtype=BIOGRID_COLUMNS, chunksize=chunk_rows)
+        for i, chunk in enumerate(chunks):
+            rows = chunk[chunk['Experimental System Type'] == system_type]
+            rows.to_csv(out, sep='\t', index=False, header=(i == 0))
+            kept += len(rows)
+            total += len(chunk)
+    return kept, total
@@ -0,0 +1,132 @@
+import numpy as np
+
+# --- COMPARISON KERNEL ---
+# Pure function over the startup-built indexes, kept apart from the FastAPI
+# handler so benchmarks and other endpoints can call it directly.
+
+class GeneListView:
+    """Everything /compare derives from one normalised gene list.
+
+    The list may mix Ensembl IDs, symbols, Entrez IDs and aliases (see
+    identifiers.py). Symbols and enrichment are computed on first use, so a
+    batch can share one view between every contrast that submits the same list.
+    """
+
+    def __init__(self, identifiers, reference, propagate=False):
+        self.identifiers = identifiers
+        self.reference = reference
+        self.propagate = propagate
+        self.resolution = reference.identifier_index.resolve(identifiers, reference.gene_universe)
+        self.gene_codes = self.resolution.gene_codes
+        # GO sets are bitsets over the interned GO axis, so set algebra between
+        # two lists is one vectorised op per result
+        go_mask = reference.gene_go_index.go_mask_for(self.gene_codes)
+        if propagate:
+            # Extend the set with every ancestor via the precomputed closure
+            go_mask = reference.go_dag.ancestor_mask(np.flatnonzero(go_mask))
+        self.go_mask = go_mask
+        self._symbols = None
+        self._enrichment = None
+
+    @property
+    def submitted_count(self):
+        return len(self.identifiers)
+
+    @property
+    def mapped_count(self):
+        return self.reference.gene_universe.mapped_count(self.gene_codes)
+
+    @property
+    def symbols(self):
+        if self._symbols is None:
+            self._symbols = self.reference.gene_universe.symbols_for(self.gene_codes)
+        return self._symbols
+
+    @property
+    def enrichment(self):
+        if self._enrichment is None:
+            background = self.reference.propagated_enrichment_background if self.propagate \
+                else self.reference.enrichment_background
+            self._enrichment = background.records(self.gene_codes, self.reference.go_term_index)
+        return self._enrichment
+
+
+def comparison_sections(view_a, view_b, reference, enrichment=False):
+    """Yield the ``(name, section)`` pairs of a /compare result, cheapest first.
+
+    Later sections are only computed when the consumer asks for them, which
+    lets the streaming endpoint send the summary and GO terms early.
+    """
+    go_term_index = reference.go_term_index
+
+    yield "summary", {
+        "up_regulated_submitted_count": view_a.submitted_count,
+        "down_regulated_submitted_count": view_b.submitted_count,
+        "up_regulated_mapped_count": view_a.mapped_count,
+        "down_regulated_mapped_count": view_b.mapped_count,
+    }
+
+    # Codes come back in GO ID order, since the GO axis is sorted
+    unique_go_a = np.flatnonzero(view_a.go_mask & ~view_b.go_mask)
+    unique_go_b = np.flatnonzero(view_b.go_mask & ~view_a.go_mask)
+    shared_go = np.flatnonzero(view_a.go_mask & view_b.go_mask)
+    yield "go_comparison", {
+        "unique_to_up_regulated": go_term_index.term_records(unique_go_a),
+        "unique_to_down_regulated": go_term_index.term_records(unique_go_b),
+        "shared": go_term_index.term_records(shared_go)
+    }
+
+    yield "gene_symbols", {
+        "up_regulated": view_a.symbols,
+        "down_regulated": view_b.symbols
+    }
+
+    yield "ppi_analysis", reference.ppi_index.analysis(view_a.gene_codes, view_b.gene_codes,
+                                                       reference.gene_universe)
+
+    if enrichment:
+        background = reference.propagated_enrichment_background if view_a.propagate \
+            else reference.enrichment_background
+        yield "enrichment", {
+            "background_size": background.size,
+            "up_regulated": view_a.enrichment,
+            "down_regulated": view_b.enrichment,
+        }
+
+    yield "identifier_resolution", {
+        "up_regulated_unmapped": view_a.resolution.unmapped,
+        "up_regulated_ambiguous": view_a.resolution.ambiguous,
+        "down_regulated_unmapped": view_b.resolution.unmapped,
+        "down_regulated_ambiguous": view_b.resolution.ambiguous,
+    }
+
+
+def compare_views(view_a, view_b, reference, enrichment=False):
+    return dict(comparison_sections(view_a, view_b, reference, enrichment))
+
+
+def compare_gene_sets(ensembl_ids_a, ensembl_ids_b, reference, enrichment=False, propagate=False):
+    view_a = GeneListView(ensembl_ids_a, reference, propagate)
+    view_b = GeneListView(ensembl_ids_b, reference, propagate)
+    return compare_views(view_a, view_b, reference, enrichment)
+
+
+def compare_gene_set_batch(contrasts, reference):
+    """Compare many ``(ensembl_ids_a, ensembl_ids_b, enrichment, propagate)`` contrasts.
+
+    Each distinct gene list is looked up, expanded to GO codes (and tested for
+    enrichment) once, however many contrasts reuse it. Results keep input order.
+    """
+    views = {}
+
+    def view_for(identifiers, propagate):
+        key = (frozenset(identifiers), propagate)
+        if key not in views:
+            views[key] = GeneListView(identifiers, reference, propagate)
+        return views[key]
+
+    return [
+        compare_views(view_for(ensembl_ids_a, propagate), view_for(ensembl_ids_b, propagate),
+                      reference, enrichment)
+        for ensembl_ids_a, ensembl_ids_b, enrichment, propagate in contrasts
+    ]
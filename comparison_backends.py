@@ -0,0 +1,149 @@
+import json
+from sqlalchemy import text
+from comparison import compare_gene_sets
+from data_loader import live_rows_filter, read_table
+from identifiers import ENSEMBL_GENE_ID, IdentifierIndex
+from indexes import GeneUniverse
+
+# --- COMPARISON BACKENDS ---
+# /compare can run against either engine through the same call,
+#   backend.compare(ids_a, ids_b, enrichment=False, propagate=False)
+# which returns a /compare result dict:
+#   InMemoryBackend - the startup-built indexes (comparison.py); everything
+#   SqlBackend      - one query per request against the reference tables, for
+#                     deployments that can't hold them in every worker's RAM
+# The SQL engine covers the summary, GO comparison, symbols and identifier
+# resolution. Symbols, Entrez IDs and aliases resolve through the same
+# IdentifierIndex as in memory, built from the (small) genes table at startup;
+# Ensembl IDs go to the database as they are. Enrichment and propagation
+# requests are refused, and ppi_analysis comes back empty; those need the
+# in-memory indexes.
+
+class Unsupported(ValueError):
+    pass
+
+
+class InMemoryBackend:
+    name = 'memory'
+
+    def __init__(self, reference):
+        self.reference = reference
+
+    def compare(self, ensembl_ids_a, ensembl_ids_b, enrichment=False, propagate=False):
+        return compare_gene_sets(ensembl_ids_a, ensembl_ids_b, self.reference,
+                                 enrichment=enrichment, propagate=propagate)
+
+
+# Both lists go up as array parameters and are joined against the indexed
+# ensembl_to_go(ensembl_gene_id) and genes(ensembl_gene_id) in one round trip.
+# Rows come back tagged: 'go' (GO ID, term), 'gene' (Ensembl ID, symbol) and
+# 'annotated' (Ensembl IDs with GO rows but no genes row), each with the lists
+# they belong to.
+COMPARE_SQL = """
+WITH submitted AS (
+    SELECT id, 1 AS in_a, 0 AS in_b FROM ({ids_a}) AS list_a
+    UNION ALL
+    SELECT id, 0, 1 FROM ({ids_b}) AS list_b
+), annotations AS (
+    SELECT e.go_id, MAX(s.in_a) AS in_a, MAX(s.in_b) AS in_b
+    FROM submitted s JOIN ensembl_to_go e ON e.ensembl_gene_id = s.id {live}
+    GROUP BY e.go_id
+), terms AS (
+    SELECT "GO_ID" AS go_id, MIN("GO_Term") AS term FROM go_terms
+    WHERE "GO_ID" IN (SELECT go_id FROM annotations)
+    GROUP BY "GO_ID"
+)
+SELECT 'go' AS kind, a.go_id AS id, t.term AS label, a.in_a, a.in_b
+FROM annotations a JOIN terms t ON t.go_id = a.go_id
+UNION ALL
+SELECT 'gene', s.id, g.gene_symbol, MAX(s.in_a), MAX(s.in_b)
+FROM submitted s JOIN genes g ON g.ensembl_gene_id = s.id
+GROUP BY s.id, g.gene_symbol
+UNION ALL
+SELECT 'annotated', s.id, NULL, MAX(s.in_a), MAX(s.in_b)
+FROM submitted s
+WHERE EXISTS (SELECT 1 FROM ensembl_to_go e WHERE e.ensembl_gene_id = s.id {live})
+GROUP BY s.id
+"""
+
+def array_rows(dialect, param):
+    if dialect == 'postgresql':
+        return f"SELECT unnest(CAST(:{param} AS text[])) AS id"
+    # SQLite stand-in for local runs: the array arrives as a JSON list
+    return f"SELECT value AS id FROM json_each(:{param})"
+
+def ensembl_ids(tokens):
+    """``{token: stable ID}`` for the tokens that are Ensembl gene IDs, versions stripped."""
+    return {token: token.partition('.')[0] for token in tokens if ENSEMBL_GENE_ID.match(token)}
+
+
+class SqlBackend:
+    name = 'sql'
+
+    def __init__(self, engine):
+        self.engine = engine
+        genes = read_table(engine, 'genes')
+        self.gene_universe = GeneUniverse.from_frame(genes)
+        self.identifier_index = IdentifierIndex.from_frame(genes, self.gene_universe)
+        with engine.connect() as conn:
+            live = live_rows_filter(conn, 'ensembl_to_go')
+        dialect = engine.dialect.name
+        self.query = text(COMPARE_SQL.format(ids_a=array_rows(dialect, 'ids_a'), ids_b=array_rows(dialect, 'ids_b'),
+                                             live=f"AND {live}" if live else ""))
+        self.encode_ids = list if dialect == 'postgresql' else json.dumps
+
+    def check(self, enrichment=False, propagate=False):
+        if enrichment or propagate:
+            raise Unsupported("Enrichment and GO propagation need the in-memory backend")
+
+    def resolve(self, tokens):
+        """``(ensembl, resolution)``: ``{token: stable ID}`` for Ensembl IDs, the rest resolved by key."""
+        ensembl = ensembl_ids(tokens)
+        return ensembl, self.identifier_index.resolve([token for token in tokens if token not in ensembl],
+                                                      self.gene_universe)
+
+    def compare(self, ensembl_ids_a, ensembl_ids_b, enrichment=False, propagate=False):
+        self.check(enrichment, propagate)
+        stable_ids, resolutions = zip(self.resolve(ensembl_ids_a), self.resolve(ensembl_ids_b))
+        ids_a, ids_b = (sorted(set(ids.values()) | set(self.gene_universe.gene_ids[resolution.gene_codes].tolist()))
+                        for ids, resolution in zip(stable_ids, resolutions))
+        with self.engine.connect() as conn:
+            rows = conn.execute(self.query, {"ids_a": self.encode_ids(ids_a), "ids_b": self.encode_ids(ids_b)}).all()
+
+        go = {"unique_to_up_regulated": [], "unique_to_down_regulated": [], "shared": []}
+        symbols = (set(), set())
+        mapped, resolved = (set(), set()), (set(), set())
+        for kind, id_, label, in_a, in_b in sorted(rows, key=lambda row: (row[0], row[1])):
+            if kind == 'go':
+                key = "shared" if in_a and in_b else "unique_to_up_regulated" if in_a else "unique_to_down_regulated"
+                go[key].append({"id": id_, "term": label})
+                continue
+            for side, member in enumerate((in_a, in_b)):
+                if member:
+                    resolved[side].add(id_)
+                    if kind == 'gene':
+                        mapped[side].add(id_)
+                        if label:
+                            symbols[side].add(label.upper())
+
+        def unmapped(side):
+            ensembl = [token for token, stable_id in stable_ids[side].items() if stable_id not in resolved[side]]
+            return sorted(ensembl + resolutions[side].unmapped)
+
+        return {
+            "summary": {
+                "up_regulated_submitted_count": len(ensembl_ids_a),
+                "down_regulated_submitted_count": len(ensembl_ids_b),
+                "up_regulated_mapped_count": len(mapped[0]),
+                "down_regulated_mapped_count": len(mapped[1]),
+            },
+            "go_comparison": go,
+            "gene_symbols": {"up_regulated": sorted(symbols[0]), "down_regulated": sorted(symbols[1])},
+            "ppi_analysis": {"internal_up_regulated": [], "cross_talk": [], "internal_down_regulated": []},
+            "identifier_resolution": {
+                "up_regulated_unmapped": unmapped(0),
+                "up_regulated_ambiguous": resolutions[0].ambiguous,
+                "down_regulated_unmapped": unmapped(1),
+                "down_regulated_ambiguous": resolutions[1].ambiguous,
+            },
+        }
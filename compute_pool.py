@@ -0,0 +1,75 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# --- COMPARISON WORKER POOL ---
+# The comparison kernel and response encoding are CPU work. Running them on the
+# event loop would stall every other request on the worker, `/` and static
+# files included, so handlers hand them to a small thread pool (numpy releases
+# the GIL in the heavy array ops). At most `workers` jobs run at once and at
+# most `queue_depth` more wait; beyond that the pool refuses work instead of
+# letting the backlog grow. workers=0 runs jobs inline on the event loop.
+
+class PoolFull(Exception):
+    pass
+
+
+class ComputePool:
+    def __init__(self, workers=4, queue_depth=64):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='compare') if workers else None
+        self.pending = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self):
+        return self.workers + self.queue_depth
+
+    def _admit(self):
+        # Only the event loop thread touches `pending`, so no lock is needed
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            raise PoolFull(f"{self.pending} comparisons running or queued")
+
+    async def _submit(self, job):
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, job)
+        finally:
+            self.pending -= 1
+
+    async def run(self, fn, *args, **kwargs):
+        if self.executor is None:
+            return fn(*args, **kwargs)
+        self._admit()
+        return await self._submit(functools.partial(fn, *args, **kwargs))
+
+    def iterate(self, iterator):
+        """Async iterator driving a blocking one from the pool, one item per job.
+
+        Admission is checked once, here; items of a stream already being sent
+        are never refused.
+        """
+        if self.executor is not None:
+            self._admit()
+        return self._iterate(iterator)
+
+    async def _iterate(self, iterator):
+        done = object()
+        while True:
+            if self.executor is None:
+                item = next(iterator, done)
+            else:
+                item = await self._submit(functools.partial(next, iterator, done))
+            if item is done:
+                return
+            yield item
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        return {"workers": self.workers, "queue_depth": self.queue_depth,
+                "pending": self.pending, "rejected": self.rejected}
@@ -12,9 +12,13 @@ DATASET = "hsapiens_gene_ensembl"
 ATTRIBUTES = [
     "ensembl_gene_id",
     "entrezgene_id",
-    "hgnc_symbol"
+    "hgnc_symbol",
+    "external_synonym"  # HGNC aliases and previous symbols, one row per synonym
 ]
 
+# Synonyms are collapsed into one '|'-separated column per gene (read by identifiers.py)
+SYNONYM_COLUMN = "gene_synonyms"
+
 print("--- Starting Step 1: Fetch Human Gene Info ---")
 
 # --- Ensure output directory exists ---
@@ -23,14 +27,13 @@ if not os.path.exists(OUTPUT_DIR):
     print(f"Created output directory: {OUTPUT_DIR}")
 
 # --- Construct the BioMart Query XML ---
+attribute_xml = "\n".join(f'        <Attribute name = "{attribute}" />' for attribute in ATTRIBUTES)
 query_xml = f"""
 <?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE Query>
 <Query  virtualSchemaName = "default" formatter = "CSV" header = "0" uniqueRows = "0" count = "" datasetConfigVersion = "0.6" >
     <Dataset name = "{DATASET}" interface = "default" >
-        <Attribute name = "{ATTRIBUTES[0]}" />
-        <Attribute name = "{ATTRIBUTES[1]}" />
-        <Attribute name = "{ATTRIBUTES[2]}" />
+{attribute_xml}
     </Dataset>
 </Query>
 """
@@ -55,6 +58,12 @@ try:
     # Convert Entrez ID to integer, handling potential missing values
     # Coerce errors will turn non-numeric values into NaT (Not a Time) which we then fill
     df['entrezgene_id'] = pd.to_numeric(df['entrezgene_id'], errors='coerce').fillna(0).astype(int)
+
+    # BioMart returns one row per synonym; collapse them back to one row per gene
+    key_columns = ["ensembl_gene_id", "entrezgene_id", "hgnc_symbol"]
+    df = df.groupby(key_columns, sort=False)['external_synonym'] \
+        .agg(lambda synonyms: '|'.join(sorted(set(synonyms.dropna().astype(str))))) \
+        .rename(SYNONYM_COLUMN).reset_index()
     
     print(f"Cleaned data, resulting in {len(df)} genes with complete core info.")
 
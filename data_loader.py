@@ -0,0 +1,310 @@
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pyarrow as pa
+from pandas.api.types import union_categoricals
+from sqlalchemy import bindparam, inspect, text
+from identifiers import SYNONYM_COLUMN
+from indexes import ENTREZ_COLUMNS
+
+# --- REFERENCE TABLES ---
+# The tables /compare is built from; optional ones are skipped when the database
+# does not have them. A table's version keys the snapshot cache and tells a
+# reload whether the table changed. It comes from `data_versions` (optional; one
+# row per table: table_name, version) when that has a row for the table, else
+# from Postgres' cumulative insert/update/delete counters for it. Without either
+# (e.g. SQLite) the table is always read and versioned by a hash of its content,
+# and it is never snapshot-cached.
+TABLES = ('genes', 'go_terms', 'ensembl_to_go')
+OPTIONAL_TABLES = ('go_parents',)
+VERSION_TABLE = 'data_versions'
+
+# Only the columns /compare uses are selected; optional ones are skipped when the
+# table lacks them. ID columns are read into categoricals chunk by chunk.
+TABLE_COLUMNS = {
+    'genes': ['ensembl_gene_id', 'gene_symbol', *ENTREZ_COLUMNS, SYNONYM_COLUMN],
+    'go_terms': ['GO_ID', 'GO_Term'],
+    'ensembl_to_go': ['ensembl_gene_id', 'go_id'],
+    'go_parents': ['go_id', 'parent_go_id', 'relation'],
+}
+ID_COLUMNS = {'ensembl_gene_id', 'go_id', 'GO_ID', 'parent_go_id'}
+CHUNK_ROWS = int(os.environ.get("DB_CHUNK_ROWS", "100000"))
+
+# --- DELTA SYNC ---
+# A table listed here may carry an `updated_at` column (bumped on every insert
+# or update) and a `deleted` flag (soft deletes). When it does, its version also
+# records the newest updated_at, and a reload pulls only the keys of rows
+# changed since the previous watermark, then re-reads every live row of those
+# keys; re-reading whole keys keeps the step idempotent. updated_at is stamped
+# before its transaction commits, so a row committed after the watermark was
+# read can carry an older timestamp. On Postgres the version therefore also
+# records when the oldest transaction then still writing began (from
+# pg_stat_activity, which needs pg_read_all_stats to see other roles' sessions),
+# and the next delta reads from there instead; the table's change counters in
+# the version make such a commit alone trigger a reload. With no writer open,
+# the delta reads strictly after the watermark, so a sync with nothing new
+# reads no rows. SQLite, the local stand-in, has no such view and always reads
+# strictly after the watermark. Hard deletes leave no
+# trace there, so if the row count after applying a delta disagrees with the
+# database the table is read in full instead; so is a new data_versions release,
+# which uploader.py records when it swaps in a whole new table.
+DELTA_TABLES = {'ensembl_to_go': 'ensembl_gene_id'}
+UPDATED_COLUMN = 'updated_at'
+DELETED_COLUMN = 'deleted'
+WATERMARK = ';watermark:'
+PENDING = ';pending:'
+DELTA_KEY_BATCH = 10_000
+
+def table_columns(conn, table):
+    return {column['name'] for column in inspect(conn).get_columns(table)}
+
+def live_rows_filter(conn, table):
+    if DELETED_COLUMN not in table_columns(conn, table):
+        return ""
+    deleted = conn.dialect.identifier_preparer.quote(DELETED_COLUMN)
+    return f"({deleted} IS NULL OR NOT {deleted})"
+
+def change_counters(conn, table):
+    # Only ever grow while the table lives (a stats reset just forces one extra
+    # reload); relid changes when uploader.py swaps a new table in. Writers'
+    # backends flush them up to ~10s after committing, so a change can show up
+    # one reload check late.
+    row = conn.execute(text(
+        "SELECT relid, n_tup_ins, n_tup_upd, n_tup_del FROM pg_stat_user_tables "
+        "WHERE relname = :table AND schemaname = current_schema()"), {"table": table}).first()
+    return None if row is None else f"changes:{':'.join(str(value) for value in row)}"
+
+def table_version(engine, table):
+    """Version string of ``table``, or None when the database has no cheap fingerprint of it."""
+    override = os.environ.get("DATA_SNAPSHOT_VERSION")
+    if override:
+        return f"override:{override}"
+    with engine.connect() as conn:
+        release, changes = None, None
+        if inspect(conn).has_table(VERSION_TABLE):
+            version = conn.execute(
+                text(f"SELECT version FROM {VERSION_TABLE} WHERE table_name = :table"),
+                {"table": table},
+            ).scalar()
+            release = f"version:{version}" if version is not None else None
+        if conn.dialect.name == 'postgresql':
+            changes = change_counters(conn, table)
+        if table in DELTA_TABLES and UPDATED_COLUMN in table_columns(conn, table):
+            watermark = conn.execute(text(f"SELECT MAX({UPDATED_COLUMN}) FROM {table}")).scalar()
+            if watermark is not None:
+                # updated_at is bumped on every write, so with the row count
+                # (which catches hard deletes) it fingerprints the table
+                if changes is None:
+                    changes = f"rows:{conn.execute(text(f'SELECT COUNT(*) FROM {table}')).scalar()}"
+                version = f"{';'.join(filter(None, [release, changes]))}{WATERMARK}{watermark}"
+                if conn.dialect.name == 'postgresql':
+                    pending = conn.execute(PENDING_WRITES, {"watermark": watermark}).scalar()
+                    if pending is not None:
+                        version += f"{PENDING}{pending}"
+                return version
+    return release or changes
+
+def content_version(df):
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return f"content:{digest.hexdigest()[:16]}"
+
+# Start of the oldest other transaction that has written and is still open
+PENDING_WRITES = text(
+    "SELECT MIN(xact_start) FROM pg_stat_activity "
+    "WHERE backend_xid IS NOT NULL AND pid <> pg_backend_pid() AND xact_start < :watermark")
+
+def version_watermark(version):
+    """The point a delta from ``version`` reads after: its watermark, or its oldest pending writer."""
+    if WATERMARK not in version:
+        return None
+    watermark = version.split(WATERMARK, 1)[1]
+    return watermark.split(PENDING, 1)[1] if PENDING in watermark else watermark
+
+def version_release(version):
+    """The data_versions part of ``version``, or None."""
+    return next((part for part in version.split(';') if part.startswith('version:')), None)
+
+def to_categoricals(df):
+    for column in df.columns.intersection(list(ID_COLUMNS)):
+        df[column] = df[column].astype('category')
+    return df
+
+def concat_chunks(chunks, columns):
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    data = {}
+    for column in columns:
+        parts = [chunk[column] for chunk in chunks]
+        if column in ID_COLUMNS:
+            # Merge chunk dictionaries instead of falling back to object columns
+            data[column] = pd.Series(union_categoricals([part.array for part in parts]))
+        else:
+            data[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(data)
+
+def read_table(engine, table):
+    with engine.connect() as conn:
+        available = table_columns(conn, table)
+        columns = [column for column in TABLE_COLUMNS[table] if column in available]
+        quote = conn.dialect.identifier_preparer.quote
+        query = f"SELECT {', '.join(quote(column) for column in columns)} FROM {quote(table)}"
+        live = live_rows_filter(conn, table) if table in DELTA_TABLES else ""
+        if live:
+            query += f" WHERE {live}"
+
+        # Server-side cursor: rows arrive CHUNK_ROWS at a time rather than all at once
+        conn = conn.execution_options(stream_results=True)
+        chunks = [to_categoricals(chunk) for chunk in pd.read_sql_query(query, conn, chunksize=CHUNK_ROWS)]
+    return concat_chunks(chunks, columns)
+
+def read_delta(engine, table, watermark):
+    """Return ``(changed_keys, rows, live_count)`` for rows updated after ``watermark``.
+
+    ``rows`` holds every live row of the changed keys, ``live_count`` the
+    table's live row count to check the result against.
+    """
+    key = DELTA_TABLES[table]
+    with engine.connect() as conn:
+        available = table_columns(conn, table)
+        columns = [column for column in TABLE_COLUMNS[table] if column in available]
+        quote = conn.dialect.identifier_preparer.quote
+        live = live_rows_filter(conn, table)
+        changed_keys = conn.execute(
+            text(f"SELECT DISTINCT {quote(key)} FROM {quote(table)} WHERE {quote(UPDATED_COLUMN)} > :watermark"),
+            {"watermark": watermark},
+        ).scalars().all()
+
+        conditions = " AND ".join(filter(None, [f"{quote(key)} IN :keys", live]))
+        query = text(f"SELECT {', '.join(quote(column) for column in columns)} FROM {quote(table)} "
+                     f"WHERE {conditions}").bindparams(bindparam('keys', expanding=True))
+        chunks = [to_categoricals(pd.read_sql_query(query, conn, params={"keys": changed_keys[i:i + DELTA_KEY_BATCH]}))
+                  for i in range(0, len(changed_keys), DELTA_KEY_BATCH)]
+        live_count = conn.execute(
+            text(f"SELECT COUNT(*) FROM {quote(table)}" + (f" WHERE {live}" if live else ""))).scalar()
+    return changed_keys, concat_chunks(chunks, columns), live_count
+
+def apply_delta(df, table, changed_keys, rows):
+    """Replace every row of ``changed_keys`` in ``df`` with ``rows``."""
+    kept = df[~df[DELTA_TABLES[table]].isin(changed_keys)]
+    return concat_chunks([to_categoricals(kept), to_categoricals(rows)], list(df.columns))
+
+def sync_table(engine, table, df, previous_version, version):
+    """Bring ``df`` from ``previous_version`` to ``version``; None when a full read is needed."""
+    watermark = version_watermark(previous_version)
+    if table not in DELTA_TABLES or watermark is None:
+        return None
+    release = version_release(previous_version)
+    if release is not None and release != version_release(version):
+        # A new data_versions release (uploader.py swaps in a whole new table)
+        return None
+    changed_keys, rows, live_count = read_delta(engine, table, watermark)
+    synced = apply_delta(df, table, changed_keys, rows)
+    if len(synced) != live_count:
+        print(f"-> WARNING: '{table}' delta left {len(synced)} rows, database has {live_count}; reading it in full.")
+        return None
+    return synced, changed_keys
+
+
+# --- LOCAL COLUMNAR SNAPSHOT CACHE ---
+# Each table is written once as an uncompressed Arrow IPC file named after its
+# version, then memory-mapped on later starts (columns stay Arrow-backed, so the
+# pages are shared with the OS page cache instead of copied into every worker).
+
+def snapshot_path(cache_dir, table, version):
+    digest = hashlib.sha1(version.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{table}-{digest}.arrow")
+
+def write_snapshot(df, path):
+    arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+    # Atomic rename so concurrent workers never see a half-written snapshot
+    os.replace(tmp_path, path)
+
+def read_snapshot(path):
+    # The map is left open: the Arrow-backed columns reference its pages directly
+    arrow_table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    # Dictionary-encoded ID columns come back as categoricals, the rest Arrow-backed
+    return arrow_table.to_pandas(
+        types_mapper=lambda arrow_type: None if pa.types.is_dictionary(arrow_type) else pd.ArrowDtype(arrow_type))
+
+def remove_stale_snapshots(cache_dir, table, keep_path):
+    for filename in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, filename)
+        if filename.startswith(f"{table}-") and filename.endswith('.arrow') and path != keep_path:
+            os.remove(path)
+
+def load_table(engine, table, cache_dir=None, previous=None, deltas=None):
+    """Return ``(df, source, version)``; ``previous`` is a ``(df, version)`` already in memory.
+
+    When ``previous`` could be brought up to date by a delta, the changed keys
+    are recorded in ``deltas[table]``.
+    """
+    version = table_version(engine, table)
+    if version is None:
+        df = read_table(engine, table)
+        version = content_version(df)
+        if previous is not None and previous[1] == version:
+            # Keep the frame already in memory, so a reload sees nothing changed
+            return previous[0], 'database (unchanged)', version
+        return df, 'database', version
+    if previous is not None and previous[1] == version:
+        return previous[0], 'memory', version
+    path = snapshot_path(cache_dir, table, version) if cache_dir else None
+    if path and os.path.exists(path):
+        return read_snapshot(path), 'snapshot', version
+
+    synced = sync_table(engine, table, *previous, version) if previous is not None else None
+    if synced is not None:
+        df, changed_keys = synced
+        if deltas is not None:
+            deltas[table] = changed_keys
+        source = f"delta of {len(changed_keys)} keys"
+    else:
+        df, source = read_table(engine, table), 'database'
+    if not path:
+        return df, source, version
+
+    os.makedirs(cache_dir, exist_ok=True)
+    write_snapshot(df, path)
+    remove_stale_snapshots(cache_dir, table, path)
+    return read_snapshot(path), source, version
+
+def timed_load_table(engine, table, cache_dir=None, previous=None, deltas=None):
+    start = time.perf_counter()
+    df, source, version = load_table(engine, table, cache_dir, previous, deltas)
+    size_mb = df.memory_usage(deep=True).sum() / 1e6
+    # One write per line so messages from the loader threads don't interleave
+    print(f"-> Loaded '{table}' ({len(df)} rows, {size_mb:.1f} MB) from {source} "
+          f"in {time.perf_counter() - start:.2f}s.\n", end='')
+    return df, version
+
+def available_tables(engine):
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+        optional = [table for table in OPTIONAL_TABLES if inspector.has_table(table)]
+    return list(TABLES) + optional
+
+def load_tables(engine, cache_dir=None, previous=None, deltas=None):
+    """Return ``(frames, versions)``, both keyed by table name, loading tables concurrently.
+
+    ``previous`` is an earlier ``(frames, versions)``; tables whose version has
+    not changed since are reused from it instead of being read again, and
+    delta-synced ones only pull what changed (their keys land in ``deltas``).
+    """
+    previous_frames, previous_versions = previous or ({}, {})
+
+    def load(table):
+        earlier = (previous_frames[table], previous_versions[table]) if table in previous_frames else None
+        return timed_load_table(engine, table, cache_dir, earlier, deltas)
+
+    tables = available_tables(engine)
+    with ThreadPoolExecutor(max_workers=len(tables)) as pool:
+        results = list(pool.map(load, tables))
+    frames = {table: df for table, (df, _) in zip(tables, results)}
+    versions = {table: version for table, (_, version) in zip(tables, results)}
+    return frames, versions
@@ -1,24 +1,7 @@
-import pandas as pd
 import os
-import requests
-
-# --- HELPER FUNCTION TO PARSE GO DICTIONARY ---
-def parse_obo(file_path):
-    go_terms = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        term_data = {}
-        for line in f:
-            line = line.strip()
-            if line == '[Term]':
-                if term_data and 'id' in term_data:
-                    go_terms.append({'GO_ID': term_data['id'], 'GO_Term': term_data.get('name', '')})
-                term_data = {}
-            elif ':' in line:
-                key, value = line.split(':', 1)
-                term_data[key.strip()] = value.strip()
-    if term_data and 'id' in term_data:
-        go_terms.append({'GO_ID': term_data['id'], 'GO_Term': term_data.get('name', '')})
-    return pd.DataFrame(go_terms)
+from obo_parser import write_go_tables
+from mart_export import EnsemblToGo, GeneMap, ingest_mart_export
+from biogrid import filter_biogrid, find_biogrid_release
 
 # --- SETUP ---
 RAW_DATA_DIR = 'raw_data'
@@ -37,56 +20,40 @@ print("Processing GO dictionary (go-basic.obo)...")
 obo_file_path = raw_path('go-basic.obo')
 # (Assuming this file was downloaded by a previous script version)
 if os.path.exists(obo_file_path):
-    go_map_df = parse_obo(obo_file_path)
-    go_map_df.to_csv(processed_path('go_terms.tsv'), sep='\t', index=False)
-    print("-> Clean 'go_terms.tsv' created.")
+    # Streams terms and their is_a / part_of parents straight to disk
+    n_terms = write_go_tables(obo_file_path, processed_path('go_terms.tsv'), processed_path('go_parents.tsv'))
+    print(f"-> Clean 'go_terms.tsv' created ({n_terms} terms).")
+    print("-> GO DAG edges saved to 'go_parents.tsv'.")
 else:
     print("-> WARNING: go-basic.obo not found. Skipping GO term processing.")
 
 
-# --- 1. PROCESS ENSEMBL TO GO MAPPING ---
-print("Processing Ensembl to GO mapping file...")
-ensembl_go_path = raw_path('mart_export.txt.gz') # This is the new file from BioMart
-if os.path.exists(ensembl_go_path):
-    ensembl_go_df = pd.read_csv(ensembl_go_path, compression='gzip', sep='\t')
-    # Rename columns for clarity
-    ensembl_go_df.rename(columns={
-        'Gene stable ID': 'ensembl_gene_id',
-        'GO term accession': 'go_id'
-    }, inplace=True)
-    # Drop any rows where GO ID is missing
-    ensembl_go_df.dropna(subset=['go_id'], inplace=True)
-    ensembl_go_df.to_csv(processed_path('ensembl_to_go.tsv'), sep='\t', index=False)
-    print("-> Clean 'ensembl_to_go.tsv' saved.")
+# --- 1. PROCESS ENSEMBL BIOMART EXPORT ---
+# One streaming pass over the export writes every table derived from it
+print("Processing Ensembl BioMart export (GO mapping and gene map)...")
+mart_export_path = raw_path('mart_export.txt.gz') # This is the new file from BioMart
+if os.path.exists(mart_export_path):
+    written = ingest_mart_export(mart_export_path, [
+        EnsemblToGo(processed_path('ensembl_to_go.tsv')),
+        GeneMap(processed_path('gene_map.tsv')),
+    ])
+    for table in written:
+        print(f"-> Clean '{os.path.basename(table.path)}' saved ({table.rows} rows).")
 else:
-     print(f"-> WARNING: {os.path.basename(ensembl_go_path)} not found. Skipping.")
+     print(f"-> WARNING: {os.path.basename(mart_export_path)} not found. Skipping.")
 
 
-# --- 2. PROCESS OTHER FILES (GENE INFO, PPIs, etc.) ---
-# This part of the script remains the same as before, processing the other files.
+# --- 2. PROCESS OTHER FILES (PPIs, etc.) ---
 print("Processing remaining data files...")
 
-# Process Gene Info
-try:
-    gene_info_df = pd.read_csv(raw_path('mart_export.txt.gz'), compression='gzip', sep='\t')
-    gene_info_df.rename(columns={
-        'Gene stable ID': 'ensembl_gene_id', 'Gene name': 'gene_symbol'
-    }, inplace=True)
-    # Select only the columns we need for mapping
-    gene_map_df = gene_info_df[['ensembl_gene_id', 'gene_symbol']].dropna().drop_duplicates()
-    gene_map_df.to_csv(processed_path('gene_map.tsv'), sep='\t', index=False)
-    print("-> Clean 'gene_map.tsv' saved.")
-except FileNotFoundError:
-    print("-> WARNING: Could not find original mart_export.txt.gz for gene mapping. Skipping.")
-
-
-# Process BioGRID
-try:
-    biogrid_df = pd.read_csv(raw_path('BIOGRID-ORGANISM-Homo_sapiens-5.0.250.tab3.txt'), sep='\t', low_memory=False)
-    filtered_biogrid_df = biogrid_df[biogrid_df['Experimental System Type'] == 'physical'].copy()
-    filtered_biogrid_df.to_csv(processed_path('filtered_biogrid.tsv'), sep='\t', index=False)
-    print("-> Clean 'filtered_biogrid.tsv' saved.")
-except FileNotFoundError:
+# Process BioGRID (newest human tab3 release in raw_data, plain, .gz or .zip)
+biogrid_release = find_biogrid_release(RAW_DATA_DIR)
+if biogrid_release:
+    biogrid_path, biogrid_version = biogrid_release
+    kept, total = filter_biogrid(biogrid_path, processed_path('filtered_biogrid.tsv'))
+    print(f"-> Clean 'filtered_biogrid.tsv' saved from BioGRID {biogrid_version} "
+          f"({kept} of {total} interactions are physical).")
+else:
     print("-> WARNING: BioGRID file not found. Skipping.")
 
 
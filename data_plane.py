@@ -0,0 +1,124 @@
+import fcntl
+import json
+import os
+import shutil
+import time
+import numpy as np
+from reference import ReferenceData
+
+# --- SHARED-MEMORY DATA PLANE ---
+# One loader process flattens ReferenceData into .npy files under
+# <root>/plane-<timestamp>/ and points the <root>/current symlink at it. Workers
+# np.load them with mmap_mode='r', so N uvicorn workers share a single copy of
+# the index pages through the OS page cache instead of each loading the tables.
+# A reload refreshes the plane once for all of them: one worker re-reads the
+# database and publishes a new plane if anything changed, and every worker
+# re-attaches when it sees `current` move.
+
+MANIFEST = 'manifest.json'
+CURRENT = 'current'
+LOCK = '.lock'
+CHECKED = '.checked'
+
+def current_plane_dir(root):
+    return os.path.join(root, CURRENT)
+
+def current_plane_name(root):
+    """Name of the plane ``current`` points at, or None before the first build."""
+    path = current_plane_dir(root)
+    return os.path.basename(os.path.realpath(path)) if os.path.exists(path) else None
+
+def write_data_plane(root, reference, versions=None):
+    os.makedirs(root, exist_ok=True)
+    plane_name = f"plane-{time.time_ns()}"
+    plane_dir = os.path.join(root, plane_name)
+    os.makedirs(plane_dir)
+
+    arrays = reference.to_arrays()
+    for name, array in arrays.items():
+        np.save(os.path.join(plane_dir, f"{name}.npy"), np.ascontiguousarray(array))
+    with open(os.path.join(plane_dir, MANIFEST), 'w') as f:
+        json.dump({'arrays': sorted(arrays), 'versions': versions or {}, 'built_at': time.time()}, f)
+
+    # Swap the symlink atomically; workers still mapping the old plane keep its
+    # (unlinked) files alive until they let go of them
+    tmp_link = os.path.join(root, f"{CURRENT}.{os.getpid()}.tmp")
+    os.symlink(plane_name, tmp_link)
+    os.replace(tmp_link, current_plane_dir(root))
+    for name in os.listdir(root):
+        if name.startswith('plane-') and name != plane_name:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    return plane_dir
+
+def attach_data_plane(root):
+    plane_dir = os.path.realpath(current_plane_dir(root))
+    with open(os.path.join(plane_dir, MANIFEST)) as f:
+        manifest = json.load(f)
+    manifest['plane'] = os.path.basename(plane_dir)
+    arrays = {name: np.load(os.path.join(plane_dir, f"{name}.npy"), mmap_mode='r')
+              for name in manifest['arrays']}
+    return ReferenceData.from_arrays(arrays), manifest
+
+def plane_versions(root):
+    with open(os.path.join(current_plane_dir(root), MANIFEST)) as f:
+        return json.load(f)['versions']
+
+def refresh_data_plane(root, load, build, min_interval=0.0):
+    """Publish a new plane if the source data changed since the current one was built.
+
+    ``load`` returns ``(frames, versions)`` and ``build(frames)`` the reference.
+    Returns whether a plane was published. Only one worker checks at a time (the
+    rest return False at once), and none within ``min_interval`` seconds of the
+    last check, so workers reloading on the same schedule read the database once.
+    """
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK), 'w') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        try:
+            checked = os.path.join(root, CHECKED)
+            if min_interval and os.path.exists(checked) and time.time() - os.path.getmtime(checked) < min_interval:
+                return False
+            frames, versions = load()
+            with open(checked, 'w'):
+                pass
+            if os.path.exists(current_plane_dir(root)) and plane_versions(root) == versions:
+                return False
+            write_data_plane(root, build(frames), versions)
+            print(f"-> Data plane refreshed in {root}.")
+            return True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def ensure_data_plane(root, build):
+    """Attach to the data plane under ``root``, building it first if missing.
+
+    ``build`` returns ``(reference, versions)``. An exclusive file lock makes the
+    first worker to arrive the only loader; the rest block, then attach.
+    """
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if not os.path.exists(current_plane_dir(root)):
+                reference, versions = build()
+                write_data_plane(root, reference, versions)
+                print(f"-> Data plane written to {root}.")
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+    return attach_data_plane(root)
+
+
+# --- STANDALONE LOADER ---
+# `python data_plane.py` (re)builds the plane from the configured database ahead
+# of starting `uvicorn main:app --workers N` with DATA_PLANE_DIR set.
+if __name__ == "__main__":
+    from main import DATA_PLANE_DIR, load_reference_data
+
+    if not DATA_PLANE_DIR:
+        raise SystemExit("Set DATA_PLANE_DIR to the directory the data plane should be written to.")
+    reference, versions = load_reference_data()
+    write_data_plane(DATA_PLANE_DIR, reference, versions)
+    print(f"✅ Data plane written to {DATA_PLANE_DIR}: {reference.describe()}.")
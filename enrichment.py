@@ -0,0 +1,111 @@
+import numpy as np
+from scipy.special import gammaln
+from indexes import gather_csr, sorted_unique
+
+# --- GO ENRICHMENT ---
+# One-sided hypergeometric test for over-representation of every GO term touched
+# by a gene list, against the background of mapped genes that carry at least one
+# GO annotation, followed by Benjamini-Hochberg FDR. Everything is computed for
+# all touched terms at once with numpy/scipy; there is no loop over terms.
+
+def log_choose(n, k):
+    return gammaln(n + 1) - gammaln(k + 1) - gammaln(n - k + 1)
+
+def hypergeom_sf(k, M, K, N):
+    """P(X >= k) for X ~ Hypergeom(M population, K successes, N drawn), vectorised over ``k`` and ``K``.
+
+    scipy's hypergeom.sf costs ~0.2 ms per term, which made it most of every
+    enrichment request. Here the first pmf term comes from log-binomials and
+    the rest of the tail from the pmf ratio, walking away from the mode (where
+    terms only shrink) until they stop adding to the sum: the upper tail from
+    k up, or the lower tail from k - 1 down and then 1 minus it. Every step is
+    one numpy pass over the terms still converging.
+    """
+    k = np.asarray(k, dtype=np.float64)
+    K = np.asarray(K, dtype=np.float64)
+    low, high = np.maximum(0, N - (M - K)), np.minimum(K, N)
+    upper = k > np.floor((N + 1) * (K + 1) / (M + 2))
+    x = np.where(upper, k, k - 1)
+    valid = (x >= low) & (x <= high)
+    term = np.zeros(len(k))
+    term[valid] = np.exp(log_choose(K[valid], x[valid]) + log_choose(M - K[valid], N - x[valid])
+                         - log_choose(M, N))
+    total = term.copy()
+
+    active = np.flatnonzero(term > 0)
+    while len(active):
+        x_a, K_a, up = x[active], K[active], upper[active]
+        ratio = np.where(up, (K_a - x_a) * (N - x_a) / ((x_a + 1) * (M - K_a - N + x_a + 1)),
+                         x_a * (M - K_a - N + x_a) / ((K_a - x_a + 1) * (N - x_a + 1)))
+        x_a = np.where(up, x_a + 1, x_a - 1)
+        inside = np.where(up, x_a <= high[active], x_a >= low[active])
+        t = np.where(inside, term[active] * ratio, 0.0)
+        x[active], term[active] = x_a, t
+        total[active] += t
+        active = active[t > total[active] * 1e-17]
+    return np.where(upper, total, np.clip(1.0 - total, 0.0, 1.0))
+
+def benjamini_hochberg(p_values):
+    m = len(p_values)
+    if m == 0:
+        return p_values
+    order = np.argsort(p_values)
+    ranked = p_values[order] * m / np.arange(1, m + 1)
+    # Enforce monotonicity from the largest p-value down
+    q_values = np.minimum.accumulate(ranked[::-1])[::-1]
+    fdr = np.empty(m, dtype=np.float64)
+    fdr[order] = np.minimum(q_values, 1.0)
+    return fdr
+
+class EnrichmentBackground:
+    """Per-term background counts over the annotated, mapped gene universe.
+
+    With a ``go_dag``, annotations are propagated to ancestor terms both for the
+    background counts and for every tested list.
+    """
+
+    def __init__(self, gene_go_index, background_mask, go_dag=None):
+        self.gene_go_index = gene_go_index
+        self.go_dag = go_dag
+        self.background_mask = background_mask
+        self.size = int(background_mask.sum())
+        self.term_counts = self.term_hits(np.flatnonzero(background_mask))
+
+    @classmethod
+    def from_indexes(cls, gene_universe, gene_go_index, go_dag=None):
+        annotated = np.diff(gene_go_index.offsets) > 0
+        return cls(gene_go_index, gene_universe.mapped & annotated, go_dag)
+
+    def term_hits(self, gene_codes):
+        if self.go_dag is None:
+            go_codes = gather_csr(self.gene_go_index.offsets, self.gene_go_index.indices, gene_codes)
+        else:
+            go_codes = self.go_dag.propagated_annotations(gene_codes, self.gene_go_index)
+        return np.bincount(go_codes, minlength=len(self.gene_go_index.go_ids))
+
+    def test(self, gene_codes):
+        """Return ``(go_codes, counts, p_values, fdr)`` sorted by p-value."""
+        gene_codes = sorted_unique(gene_codes[gene_codes >= 0])
+        gene_codes = gene_codes[self.background_mask[gene_codes]]
+        list_size = len(gene_codes)
+
+        counts = self.term_hits(gene_codes)
+        go_codes = np.flatnonzero(counts)
+        counts = counts[go_codes]
+
+        # P(X >= k) for X ~ Hypergeom(M background genes, K annotated to term, N drawn)
+        p_values = hypergeom_sf(counts, self.size, self.term_counts[go_codes], list_size)
+        fdr = benjamini_hochberg(p_values)
+
+        order = np.argsort(p_values, kind='stable')
+        return go_codes[order], counts[order], p_values[order], fdr[order]
+
+    def records(self, gene_codes, go_term_index):
+        go_codes, counts, p_values, fdr = self.test(gene_codes)
+        return [
+            {'id': go_id, 'term': term, 'count': count, 'background_count': background_count,
+             'p_value': p_value, 'fdr': q_value}
+            for go_id, term, count, background_count, p_value, q_value in zip(
+                go_term_index.go_ids[go_codes].tolist(), go_term_index.terms.take(go_codes),
+                counts.tolist(), self.term_counts[go_codes].tolist(), p_values.tolist(), fdr.tolist())
+        ]
@@ -0,0 +1,45 @@
+import orjson
+from fastapi.responses import Response
+from indexes import TermRecords
+
+# --- FAST JSON RESPONSES ---
+# /compare results can hold tens of thousands of GO term records. FastAPI's
+# default path walks every one through jsonable_encoder before json.dumps;
+# here orjson encodes the result directly and GO term arrays are spliced in
+# from the fragments GoTermIndex pre-encoded at startup.
+
+def _encode_default(value):
+    if isinstance(value, TermRecords):
+        return orjson.Fragment(value.to_json())
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def encode(content):
+    return orjson.dumps(content, default=_encode_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content):
+        return encode(content)
+
+
+# --- NDJSON STREAMING ---
+# /compare/stream sends a result one line at a time, in section order: a header
+# per section with its scalar fields and the length of each record list, then
+# those lists in chunks, then {"done": true}. Clients can render the summary
+# and Venn counts before the GO terms and interactions have arrived.
+
+NDJSON_CHUNK_RECORDS = 2_000
+
+def ndjson_lines(sections, chunk_records=NDJSON_CHUNK_RECORDS):
+    for name, section in sections:
+        lists = {key: value for key, value in section.items() if not isinstance(value, (int, float))}
+        fields = {key: value for key, value in section.items() if key not in lists}
+        yield encode({"section": name, "fields": fields,
+                      "counts": {key: len(value) for key, value in lists.items()}}) + b'\n'
+        for key, records in lists.items():
+            for start in range(0, len(records), chunk_records):
+                yield encode({"section": name, "key": key,
+                              "records": records[start:start + chunk_records]}) + b'\n'
+    yield b'{"done":true}\n'
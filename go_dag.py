@@ -0,0 +1,93 @@
+import numpy as np
+from indexes import (codes_mask, column_codes, csr_from_pairs, freeze, gather_csr, gather_csr_pairs,
+                     sorted_unique, unique_pairs)
+
+# --- GO DAG ---
+# The is_a / part_of graph from go-basic.obo over the interned GO axis, kept as
+# CSR parent arrays plus the full ancestor closure (each term's sorted ancestors,
+# itself included). Propagating a set of terms to the root is then one CSR
+# gather rather than a graph walk per request.
+
+PROPAGATED_RELATIONS = ('is_a', 'part_of')
+
+class GoDag:
+    def __init__(self, parent_offsets, parent_indices, ancestor_offsets, ancestor_indices):
+        self.parent_offsets = parent_offsets
+        self.parent_indices = parent_indices
+        self.ancestor_offsets = ancestor_offsets
+        self.ancestor_indices = ancestor_indices
+        freeze(parent_offsets, parent_indices, ancestor_offsets, ancestor_indices)
+
+    @classmethod
+    def from_frame(cls, go_parents_df, go_ids):
+        n_go = len(go_ids)
+        if go_parents_df is None or go_parents_df.empty:
+            return cls.from_edges(np.array([], dtype=np.int64), np.array([], dtype=np.int64), n_go)
+
+        edges = go_parents_df
+        if 'relation' in edges.columns:
+            edges = edges[edges['relation'].astype(str).isin(PROPAGATED_RELATIONS)]
+        child_codes = column_codes(go_ids, edges['go_id'])
+        parent_codes = column_codes(go_ids, edges['parent_go_id'])
+        keep = (child_codes >= 0) & (parent_codes >= 0)
+        return cls.from_edges(child_codes[keep], parent_codes[keep], n_go)
+
+    @classmethod
+    def from_edges(cls, child_codes, parent_codes, n_go):
+        children, parents = unique_pairs(child_codes, parent_codes, n_go)
+        parent_offsets, parent_indices = csr_from_pairs(children, parents, n_go)
+
+        # Transitive closure by frontier expansion: every round extends each
+        # (term, ancestor) pair found last round by that ancestor's parents, so
+        # the number of rounds is the depth of the DAG, not the number of terms.
+        # Pairs are encoded as term * width + ancestor to stay in flat int arrays.
+        width = max(n_go, 1)
+        self_codes = np.arange(n_go, dtype=np.int64)
+        closure = sorted_unique(np.concatenate([self_codes * width + self_codes, children * width + parents]))
+        frontier_rows, frontier_values = children, parents
+        while len(frontier_rows):
+            lengths = parent_offsets[frontier_values + 1] - parent_offsets[frontier_values]
+            next_values = gather_csr(parent_offsets, parent_indices, frontier_values)
+            candidates = sorted_unique(np.repeat(frontier_rows, lengths) * width + next_values)
+            new_pairs = candidates[~np.isin(candidates, closure, assume_unique=True, kind='sort')]
+            closure = np.sort(np.concatenate([closure, new_pairs]))
+            frontier_rows, frontier_values = new_pairs // width, new_pairs % width
+
+        ancestor_offsets, ancestor_indices = csr_from_pairs(closure // width, closure % width, n_go)
+        return cls(parent_offsets, parent_indices, ancestor_offsets, ancestor_indices)
+
+    def to_arrays(self):
+        return {'parent_offsets': self.parent_offsets, 'parent_indices': self.parent_indices,
+                'ancestor_offsets': self.ancestor_offsets, 'ancestor_indices': self.ancestor_indices}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays['parent_offsets'], arrays['parent_indices'],
+                   arrays['ancestor_offsets'], arrays['ancestor_indices'])
+
+    @property
+    def n_edges(self):
+        return len(self.parent_indices)
+
+    def parents(self, go_code):
+        return self.parent_indices[self.parent_offsets[go_code]:self.parent_offsets[go_code + 1]]
+
+    def ancestors(self, go_codes):
+        """Sorted union of the given terms and all of their ancestors."""
+        return np.flatnonzero(self.ancestor_mask(go_codes))
+
+    def ancestor_mask(self, go_codes):
+        """Bitset over the GO axis of the given terms and all of their ancestors."""
+        return codes_mask(gather_csr(self.ancestor_offsets, self.ancestor_indices, go_codes),
+                          len(self.ancestor_offsets) - 1)
+
+    def propagated_annotations(self, gene_codes, gene_go_index):
+        """GO codes of every (gene, term) pair once annotations are propagated.
+
+        A term is counted at most once per gene, however many of that gene's
+        direct annotations it is an ancestor of.
+        """
+        genes, direct = gather_csr_pairs(gene_go_index.offsets, gene_go_index.indices, gene_codes)
+        lengths = self.ancestor_offsets[direct + 1] - self.ancestor_offsets[direct]
+        ancestors = gather_csr(self.ancestor_offsets, self.ancestor_indices, direct)
+        return unique_pairs(np.repeat(genes, lengths), ancestors, len(self.ancestor_offsets) - 1)[1]
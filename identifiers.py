@@ -0,0 +1,125 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import NamedTuple
+from indexes import ENTREZ_COLUMNS, column_codes, csr_from_pairs, freeze, lookup_codes, sorted_unique
+
+# --- IDENTIFIER RESOLUTION ---
+# /compare accepts Ensembl IDs (with or without a version suffix), approved
+# symbols, Entrez IDs and aliases / previous symbols. Everything not found on
+# the gene axis goes through one sorted key array built at startup, with a CSR list of gene
+# codes per key, so a whole list resolves in a single vectorised binary search.
+# A key keeps only the genes from its highest-priority kind (approved symbol,
+# then Entrez ID, then alias), so an alias never shadows a current symbol; a key
+# still naming several genes is reported as ambiguous rather than guessed.
+# Tokens longer than MAX_IDENTIFIER_LENGTH are unmapped without a lookup: the
+# arrays are fixed-width, so one huge token would size every slot.
+
+SYNONYM_COLUMN = 'gene_synonyms'
+SYNONYM_SEPARATOR = '|'
+ENSEMBL_PREFIX = 'ENS'
+# A gene stable ID with an optional version (ENSG..., ENSMUSG...); symbols such as ENSA are not
+ENSEMBL_GENE_ID = re.compile(r'ENS[A-Z]*G\d+(\.\d+)?$')
+# Far above any real ID, symbol or alias
+MAX_IDENTIFIER_LENGTH = 64
+
+KEY_SYMBOL, KEY_ENTREZ, KEY_SYNONYM = 0, 1, 2
+
+
+class Resolution(NamedTuple):
+    gene_codes: np.ndarray  # sorted, unique codes of every resolved token
+    unmapped: list          # tokens matching no gene
+    ambiguous: list         # [{'token', 'ensembl_gene_ids'}] for tokens naming several genes
+
+
+class IdentifierIndex:
+    def __init__(self, keys, offsets, gene_codes):
+        self.keys = keys
+        self.offsets = offsets
+        self.gene_codes = gene_codes
+        freeze(keys, offsets, gene_codes)
+
+    @classmethod
+    def from_frame(cls, gene_info_df, gene_universe):
+        genes = gene_info_df.dropna(subset=['ensembl_gene_id'])
+        codes = column_codes(gene_universe.gene_ids, genes['ensembl_gene_id'])
+
+        parts = []
+        if 'gene_symbol' in genes.columns:
+            parts.append((genes['gene_symbol'], codes, KEY_SYMBOL))
+        entrez_column = next((c for c in ENTREZ_COLUMNS if c in genes.columns), None)
+        if entrez_column is not None:
+            entrez = pd.to_numeric(genes[entrez_column], errors='coerce').fillna(0).astype(np.int64)
+            parts.append((entrez.where(entrez > 0).astype('Int64').astype('string'), codes, KEY_ENTREZ))
+        if SYNONYM_COLUMN in genes.columns:
+            synonyms = genes[SYNONYM_COLUMN].astype('string').str.split(SYNONYM_SEPARATOR)
+            lengths = synonyms.str.len().fillna(0).astype(np.int64).to_numpy()
+            parts.append((synonyms.explode(), np.repeat(codes, lengths + (lengths == 0)), KEY_SYNONYM))
+
+        if not parts:
+            return cls(np.array([], dtype=str), np.zeros(1, dtype=np.int64), np.array([], dtype=np.int32))
+        pairs = pd.concat([
+            pd.DataFrame({'key': pd.Series(keys, dtype='string').str.strip().str.upper().to_numpy(),
+                          'gene': gene_codes, 'kind': kind})
+            for keys, gene_codes, kind in parts
+        ], ignore_index=True)
+        pairs = pairs[pairs['key'].notna() & (pairs['key'] != '') & (pairs['gene'] >= 0)]
+        # Keep each key's highest-priority kind only, then one row per (key, gene)
+        pairs = pairs[pairs['kind'] == pairs.groupby('key')['kind'].transform('min')]
+        pairs = pairs.drop_duplicates(['key', 'gene']).sort_values(['key', 'gene'])
+
+        keys = pairs['key'].to_numpy(dtype=str)
+        unique_keys = sorted_unique(keys)
+        key_codes = lookup_codes(unique_keys, keys)
+        offsets, gene_codes = csr_from_pairs(key_codes, pairs['gene'].to_numpy(), len(unique_keys))
+        return cls(unique_keys, offsets, gene_codes)
+
+    def to_arrays(self):
+        return {'keys': self.keys, 'offsets': self.offsets, 'gene_codes': self.gene_codes}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays['keys'], arrays['offsets'], arrays['gene_codes'])
+
+    def __len__(self):
+        return len(self.keys)
+
+    def resolve(self, tokens, gene_universe):
+        """Resolve upper-cased tokens to gene codes, reporting what did not resolve."""
+        tokens = list(tokens)
+        oversized = [token for token in tokens if len(token) > MAX_IDENTIFIER_LENGTH]
+        if oversized:
+            tokens = [token for token in tokens if len(token) <= MAX_IDENTIFIER_LENGTH]
+        tokens = np.sort(np.asarray(tokens, dtype=str))
+        codes = np.full(len(tokens), -1, dtype=np.int64)
+
+        # Ensembl IDs resolve on the gene axis itself; sorted, they form one
+        # contiguous run. A '.12' version suffix is only stripped on a miss.
+        start, stop = np.searchsorted(tokens, [ENSEMBL_PREFIX, ENSEMBL_PREFIX + '\U0010ffff'])
+        ensembl = tokens[start:stop]
+        ensembl_codes = gene_universe.lookup(ensembl)
+        missed = ensembl_codes < 0
+        if missed.any():
+            ensembl_codes[missed] = gene_universe.lookup(np.char.partition(ensembl[missed], '.')[:, 0])
+        codes[start:stop] = ensembl_codes
+
+        # Everything else, plus 'ENS' tokens that are no gene ID (symbols such
+        # as ENSA), goes through the key index
+        others = np.r_[0:start, start + np.flatnonzero(ensembl_codes < 0), stop:len(tokens)]
+        key_codes = lookup_codes(self.keys, tokens[others])
+        found = key_codes >= 0
+        others, key_codes = others[found], key_codes[found]
+        counts = self.offsets[key_codes + 1] - self.offsets[key_codes]
+        single = counts == 1
+        codes[others[single]] = self.gene_codes[self.offsets[key_codes[single]]]
+
+        ambiguous = [
+            {'token': token, 'ensembl_gene_ids': gene_universe.gene_ids[genes].tolist()}
+            for token, genes in zip(tokens[others[~single]].tolist(),
+                                    (self.gene_codes[self.offsets[key]:self.offsets[key + 1]]
+                                     for key in key_codes[~single].tolist()))
+        ]
+        unmapped_mask = codes < 0
+        unmapped_mask[others[~single]] = False
+        unmapped = sorted(tokens[unmapped_mask].tolist() + oversized)
+        return Resolution(sorted_unique(codes[codes >= 0]), unmapped, ambiguous)
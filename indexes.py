@@ -0,0 +1,407 @@
+import numpy as np
+import orjson
+import pandas as pd
+
+# --- INTERNING HELPERS ---
+# Identifiers are interned to dense integer codes by their position in a sorted
+# numpy string array, so lookups are a vectorised binary search and the arrays
+# themselves stay plain numpy (no per-request Python sets or DataFrame scans).
+
+def distinct_values(column):
+    column = pd.Series(column)
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return pd.Series(column.cat.categories[np.unique(column.cat.codes[column.cat.codes >= 0])])
+    return column.dropna()
+
+def build_universe(*columns):
+    values = [distinct_values(col).astype(str) for col in columns]
+    if not values:
+        return np.array([], dtype=str)
+    return np.unique(np.concatenate([v.to_numpy(dtype=str) for v in values]).astype(str))
+
+def lookup_codes(universe, values):
+    if not (isinstance(values, np.ndarray) and values.dtype.kind == 'U'):
+        values = list(values)
+    codes = np.full(len(values), -1, dtype=np.int64)
+    if len(values) == 0 or len(universe) == 0:
+        return codes
+    fits = slice(None)
+    if universe.dtype.kind == 'U' and isinstance(values, list):
+        # A value longer than every universe entry cannot match; leaving it out
+        # keeps one oversized value from sizing the whole fixed-width array
+        width = universe.dtype.itemsize // np.dtype('U1').itemsize
+        fits = np.fromiter((len(value) <= width for value in values), dtype=bool, count=len(values))
+        values = [value for value, fit in zip(values, fits) if fit]
+    values = np.asarray(values, dtype=str)
+    if len(values):
+        pos = np.searchsorted(universe, values)
+        pos[pos == len(universe)] = 0
+        codes[fits] = np.where(universe[pos] == values, pos, -1)
+    return codes
+
+def column_codes(universe, column):
+    column = pd.Series(column)
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Look up each distinct category once, then broadcast through the codes
+        category_codes = lookup_codes(universe, column.cat.categories.astype(str))
+        codes = column.cat.codes.to_numpy()
+        return np.where(codes >= 0, category_codes[codes], -1)
+    return lookup_codes(universe, column.astype(str))
+
+def freeze(*arrays):
+    for array in arrays:
+        array.flags.writeable = False
+
+def sorted_unique(values):
+    # Sort-based de-duplication: for integer codes this is far faster than
+    # np.unique, which hashes before sorting in recent numpy releases
+    values = np.sort(np.asarray(values))
+    if len(values) < 2:
+        return values
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+def codes_mask(codes, size):
+    """Boolean membership array over a universe of ``size`` codes."""
+    mask = np.zeros(size, dtype=bool)
+    mask[codes] = True
+    return mask
+
+def gather_csr_pairs(offsets, indices, rows):
+    """Return ``(row_of_each_value, values)`` for the selected CSR rows."""
+    rows = np.asarray(rows, dtype=np.int64)
+    rows = rows[rows >= 0]
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return rows[:0], indices[:0]
+    # Flat positions of every selected slice, without a Python loop over rows
+    shifts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return np.repeat(rows, lengths), indices[shifts + np.arange(total)]
+
+def gather_csr(offsets, indices, rows):
+    return gather_csr_pairs(offsets, indices, rows)[1]
+
+def unique_pairs(rows, values, n_values):
+    """De-duplicate (row, value) pairs; the result is sorted by row, then value."""
+    n_values = max(n_values, 1)
+    pairs = sorted_unique(np.asarray(rows, dtype=np.int64) * n_values + values)
+    return pairs // n_values, pairs % n_values
+
+def csr_from_pairs(rows, values, n_rows):
+    """Build ``(offsets, indices)`` from (row, value) pairs already sorted by row."""
+    offsets = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=offsets[1:])
+    return offsets, np.asarray(values, dtype=np.int32)
+
+
+# --- PACKED STRINGS ---
+class StringTable:
+    """Variable-length strings packed into one UTF-8 byte buffer plus offsets."""
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+        freeze(data, offsets)
+
+    @classmethod
+    def from_values(cls, values):
+        return cls.from_encoded([value.encode('utf-8') for value in values])
+
+    @classmethod
+    def from_encoded(cls, encoded):
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8).copy()
+        return cls(data, offsets)
+
+    def to_arrays(self, prefix):
+        return {f"{prefix}_data": self.data, f"{prefix}_offsets": self.offsets}
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix):
+        return cls(arrays[f"{prefix}_data"], arrays[f"{prefix}_offsets"])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return str(memoryview(self.data)[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def take(self, codes):
+        buffer = memoryview(self.data)
+        offsets = self.offsets
+        return [str(buffer[offsets[i]:offsets[i + 1]], 'utf-8') for i in np.asarray(codes).tolist()]
+
+    def concat(self, codes):
+        """The selected entries' bytes back to back, gathered without a Python loop."""
+        return gather_csr(self.offsets, self.data, codes).tobytes()
+
+    def take_packed(self, codes):
+        """The selected entries as a new StringTable (same data + offsets layout)."""
+        codes = np.asarray(codes, dtype=np.int64)
+        offsets = np.zeros(len(codes) + 1, dtype=np.int64)
+        np.cumsum(self.offsets[codes + 1] - self.offsets[codes], out=offsets[1:])
+        return StringTable(gather_csr(self.offsets, self.data, codes), offsets)
+
+
+# --- GENE UNIVERSE ---
+ENTREZ_COLUMNS = ('entrezgene_id', 'entrez_id', 'entrez_gene_id')
+
+class GeneUniverse:
+    """Immutable gene axis shared read-only by every request and index.
+
+    ``gene_ids`` is the sorted set of Ensembl IDs seen in the genes table or the
+    GO mapping; a gene's code is its position. Rows of the genes table are kept
+    CSR-style per gene (one Ensembl ID can carry several symbols or Entrez IDs),
+    and a gene counts as mapped when it has at least one such row.
+    """
+
+    def __init__(self, gene_ids, row_offsets, symbols, entrez_ids):
+        self.gene_ids = gene_ids
+        self.row_offsets = row_offsets
+        self.symbols = symbols
+        self.entrez_ids = entrez_ids
+        self.mapped = np.diff(row_offsets) > 0
+        freeze(gene_ids, row_offsets, symbols, entrez_ids, self.mapped)
+
+    @classmethod
+    def from_frame(cls, gene_info_df, extra_gene_ids=()):
+        genes = gene_info_df.dropna(subset=['ensembl_gene_id'])
+        gene_ids = build_universe(genes['ensembl_gene_id'], extra_gene_ids)
+
+        codes = column_codes(gene_ids, genes['ensembl_gene_id'])
+        order = np.argsort(codes, kind='stable')
+        row_offsets = np.zeros(len(gene_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(gene_ids)), out=row_offsets[1:])
+
+        if 'gene_symbol' in genes.columns:
+            symbols = genes['gene_symbol'].fillna('').astype(str).to_numpy(dtype=str)[order]
+        else:
+            symbols = np.full(len(genes), '', dtype=str)
+        entrez_column = next((c for c in ENTREZ_COLUMNS if c in genes.columns), None)
+        if entrez_column is None:
+            entrez_ids = np.zeros(len(genes), dtype=np.int64)
+        else:
+            entrez_ids = pd.to_numeric(genes[entrez_column], errors='coerce').fillna(0) \
+                .astype(np.int64).to_numpy()[order]
+        return cls(gene_ids, row_offsets, symbols, entrez_ids)
+
+    def to_arrays(self):
+        return {'gene_ids': self.gene_ids, 'row_offsets': self.row_offsets,
+                'symbols': self.symbols, 'entrez_ids': self.entrez_ids}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays['gene_ids'], arrays['row_offsets'], arrays['symbols'], arrays['entrez_ids'])
+
+    def __len__(self):
+        return len(self.gene_ids)
+
+    def lookup(self, ensembl_ids):
+        return lookup_codes(self.gene_ids, ensembl_ids)
+
+    def mapped_count(self, gene_codes):
+        gene_codes = np.asarray(gene_codes, dtype=np.int64)
+        return int(self.mapped[gene_codes[gene_codes >= 0]].sum())
+
+    def symbols_for(self, gene_codes):
+        symbols = gather_csr(self.row_offsets, self.symbols, gene_codes)
+        return np.unique(symbols[symbols != '']).tolist()
+
+    def entrez_for(self, gene_codes):
+        entrez_ids = gather_csr(self.row_offsets, self.entrez_ids, gene_codes)
+        return np.unique(entrez_ids[entrez_ids > 0]).tolist()
+
+    def row_genes(self):
+        """Gene code of every attribute row (aligned with ``symbols``/``entrez_ids``)."""
+        return np.repeat(np.arange(len(self.gene_ids), dtype=np.int64), np.diff(self.row_offsets))
+
+    def display_symbols(self, gene_codes):
+        """First symbol of each gene, falling back to its Ensembl ID; one entry per code."""
+        gene_codes = np.asarray(gene_codes, dtype=np.int64)
+        starts = self.row_offsets[gene_codes]
+        has_row = self.row_offsets[gene_codes + 1] > starts
+        symbols = np.full(len(gene_codes), '', dtype=object)
+        symbols[has_row] = self.symbols[starts[has_row]]
+        return np.where(symbols != '', symbols, self.gene_ids[gene_codes]).tolist()
+
+
+# --- GO TERM INDEX ---
+class GoTermIndex:
+    """GO term names aligned with the interned GO axis.
+
+    ``go_ids`` covers both the GO dictionary and any IDs only seen in the gene
+    mapping; the latter have no name and are left out of response records.
+    """
+
+    def __init__(self, go_ids, terms, has_term):
+        self.go_ids = go_ids
+        self.terms = terms
+        self.has_term = has_term
+        freeze(go_ids, has_term)
+        # Each named term's response record pre-encoded as JSON plus a trailing
+        # comma, so a record array is one byte gather (see json_records)
+        self.record_fragments = StringTable.from_encoded([
+            orjson.dumps({'id': go_id, 'term': term}) + b',' if named else b''
+            for go_id, term, named in zip(go_ids.tolist(), terms.take(np.arange(len(go_ids))), has_term.tolist())
+        ])
+
+    @classmethod
+    def from_frame(cls, go_terms_map_df, extra_go_ids=()):
+        terms_df = go_terms_map_df.dropna(subset=['GO_ID']).drop_duplicates(subset=['GO_ID'])
+        go_ids = build_universe(terms_df['GO_ID'], extra_go_ids)
+
+        codes = column_codes(go_ids, terms_df['GO_ID'])
+        names = np.full(len(go_ids), '', dtype=object)
+        names[codes] = terms_df['GO_Term'].fillna('').astype(str).to_numpy()
+        has_term = np.zeros(len(go_ids), dtype=bool)
+        has_term[codes] = True
+        return cls(go_ids, StringTable.from_values(names), has_term)
+
+    def to_arrays(self):
+        return {'go_ids': self.go_ids, 'has_term': self.has_term, **self.terms.to_arrays('terms')}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays['go_ids'], StringTable.from_arrays(arrays, 'terms'), arrays['has_term'])
+
+    def __len__(self):
+        return len(self.go_ids)
+
+    def named(self, go_codes):
+        go_codes = np.asarray(go_codes, dtype=np.int64)
+        return go_codes[self.has_term[go_codes]]
+
+    def records(self, go_codes):
+        go_codes = self.named(go_codes)
+        ids = self.go_ids[go_codes].tolist()
+        terms = self.terms.take(go_codes)
+        return [{'id': go_id, 'term': term} for go_id, term in zip(ids, terms)]
+
+    def term_records(self, go_codes):
+        return TermRecords(self, self.named(go_codes))
+
+    def json_records(self, go_codes):
+        """JSON array of ``records(go_codes)``, concatenated from the pre-encoded fragments."""
+        fragments = self.record_fragments.concat(self.named(go_codes))
+        return b'[' + fragments[:-1] + b']'
+
+
+class TermRecords:
+    """``{'id', 'term'}`` records of a set of GO codes, only built when iterated.
+
+    Responses encode them straight from the pre-encoded fragments (fast_json.py).
+    """
+
+    def __init__(self, go_term_index, go_codes):
+        self.go_term_index = go_term_index
+        self.go_codes = go_codes
+
+    def __len__(self):
+        return len(self.go_codes)
+
+    def __iter__(self):
+        return iter(self.go_term_index.records(self.go_codes))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TermRecords(self.go_term_index, self.go_codes[index])
+        return self.go_term_index.records(self.go_codes[index:index + 1])[0]
+
+    def to_json(self):
+        return self.go_term_index.json_records(self.go_codes)
+
+
+# --- GENE -> GO INDEX ---
+class GeneGoIndex:
+    """CSR mapping from interned Ensembl gene IDs to interned GO IDs.
+
+    Row ``g`` holds the sorted GO codes annotated to ``gene_ids[g]`` in
+    ``indices[offsets[g]:offsets[g + 1]]``.
+    """
+
+    def __init__(self, gene_ids, go_ids, offsets, indices):
+        self.gene_ids = gene_ids
+        self.go_ids = go_ids
+        self.offsets = offsets
+        self.indices = indices
+        freeze(gene_ids, go_ids, offsets, indices)
+
+    @classmethod
+    def from_frame(cls, df, gene_ids=None, go_ids=None):
+        df = df.dropna(subset=['ensembl_gene_id', 'go_id'])
+        if gene_ids is None:
+            gene_ids = build_universe(df['ensembl_gene_id'])
+        if go_ids is None:
+            go_ids = build_universe(df['go_id'])
+
+        gene_codes = column_codes(gene_ids, df['ensembl_gene_id'])
+        go_codes = column_codes(go_ids, df['go_id'])
+        keep = (gene_codes >= 0) & (go_codes >= 0)
+
+        # Sorting and de-duplicating the (gene, GO) pairs gives the CSR rows in
+        # gene order with sorted, unique GO codes.
+        rows, values = unique_pairs(gene_codes[keep], go_codes[keep], len(go_ids))
+        offsets, indices = csr_from_pairs(rows, values, len(gene_ids))
+        return cls(gene_ids, go_ids, offsets, indices)
+
+    def to_arrays(self):
+        # The gene and GO axes are owned by GeneUniverse and GoTermIndex
+        return {'offsets': self.offsets, 'indices': self.indices}
+
+    def with_rows(self, df, ensembl_ids):
+        """Copy with the rows of ``ensembl_ids`` rebuilt from their annotations in ``df``.
+
+        Every other row is copied over as-is, so applying a small delta costs a
+        few memory copies rather than a rebuild. Returns None when ``df`` names
+        genes or GO terms outside the existing axes.
+        """
+        df = df[df['ensembl_gene_id'].isin(ensembl_ids)].dropna(subset=['ensembl_gene_id', 'go_id'])
+        gene_codes = column_codes(self.gene_ids, df['ensembl_gene_id'])
+        go_codes = column_codes(self.go_ids, df['go_id'])
+        if (gene_codes < 0).any() or (go_codes < 0).any():
+            return None
+        # Genes outside the axis that have no rows left need no change
+        changed = lookup_codes(self.gene_ids, ensembl_ids)
+        changed = sorted_unique(changed[changed >= 0])
+
+        rows, values = unique_pairs(gene_codes, go_codes, len(self.go_ids))
+        starts = np.searchsorted(rows, changed, side='left')
+        stops = np.searchsorted(rows, changed, side='right')
+        lengths = np.diff(self.offsets)
+        lengths[changed] = stops - starts
+        offsets = np.zeros_like(self.offsets)
+        np.cumsum(lengths, out=offsets[1:])
+
+        pieces, copied_to = [], 0
+        for gene, start, stop in zip(changed.tolist(), starts.tolist(), stops.tolist()):
+            pieces += [self.indices[copied_to:self.offsets[gene]], values[start:stop].astype(np.int32)]
+            copied_to = self.offsets[gene + 1]
+        pieces.append(self.indices[copied_to:])
+        return GeneGoIndex(self.gene_ids, self.go_ids, offsets, np.concatenate(pieces))
+
+    @classmethod
+    def from_arrays(cls, arrays, gene_ids, go_ids):
+        return cls(gene_ids, go_ids, arrays['offsets'], arrays['indices'])
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    def lookup_genes(self, ensembl_ids):
+        return lookup_codes(self.gene_ids, ensembl_ids)
+
+    def go_mask_for(self, gene_codes):
+        """Bitset over the GO axis of every term annotated to any of the genes."""
+        return codes_mask(gather_csr(self.offsets, self.indices, gene_codes), len(self.go_ids))
+
+    def go_codes_for(self, gene_codes):
+        return np.flatnonzero(self.go_mask_for(gene_codes))
+
+    def go_ids_for(self, ensembl_ids):
+        return self.go_ids[self.go_codes_for(self.lookup_genes(ensembl_ids))]
+
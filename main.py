@@ -1,14 +1,28 @@
-import pandas as pd
 import os
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from sqlalchemy import create_engine
 from supabase import create_client, Client
 import re
+import time
+import asyncio
+import threading
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles 
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from reference import ReferenceData
+from comparison import GeneListView, comparison_sections, compare_gene_set_batch
+from comparison_backends import InMemoryBackend, SqlBackend, Unsupported
+from data_loader import load_tables
+from data_plane import attach_data_plane, current_plane_name, ensure_data_plane, refresh_data_plane
+from identifiers import MAX_IDENTIFIER_LENGTH
+from ppi import read_biogrid_tsv
+from result_cache import ResultCache, fingerprint
+from fast_json import FastJSONResponse, ndjson_lines
+from arrow_response import ArrowStreamResponse, accepts_arrow
+from compute_pool import ComputePool, PoolFull
+from admission import AdmissionControl, Overloaded, TooLarge, request_cost
 
 # --- DATABASE CONFIGURATION ---
 # Get individual connection components from environment variables
@@ -18,44 +32,216 @@ DB_HOST = os.environ.get("DB_HOST", "aws-1-us-east-2.pooler.supabase.com")
 DB_PORT = os.environ.get("DB_PORT", "6543")
 DB_NAME = os.environ.get("DB_NAME", "postgres")
 
-# Construct the proper SQLAlchemy connection string (Supabase recommended format)
-DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?sslmode=require"
+# Construct the proper SQLAlchemy connection string (Supabase recommended format).
+# DATABASE_URL overrides it, e.g. a local SQLite/Postgres stand-in for tests.
+DATABASE_URL = os.environ.get("DATABASE_URL") or \
+    f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?sslmode=require"
+
+# Optional local snapshot cache: when set, tables are cached here as Arrow files
+# keyed by table version and memory-mapped on later starts
+DATA_SNAPSHOT_DIR = os.environ.get("DATA_SNAPSHOT_DIR")
+
+# Optional shared data plane: when set, one process builds the indexes into
+# memory-mapped files here and every uvicorn worker attaches to them read-only,
+# re-attaching within DATA_PLANE_POLL_INTERVAL seconds of a new plane appearing
+DATA_PLANE_DIR = os.environ.get("DATA_PLANE_DIR")
+DATA_PLANE_POLL_INTERVAL = float(os.environ.get("DATA_PLANE_POLL_INTERVAL", "1"))
+
+# Physical interactions written by data_pipeline.py, used for the PPI analysis
+PPI_DATA_PATH = os.environ.get("PPI_DATA_PATH", os.path.join("processed_data", "filtered_biogrid.tsv"))
+
+# /compare result cache: entry and record limits and TTL (RESULT_CACHE_SIZE=0 disables it)
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "256"))
+RESULT_CACHE_MAX_RECORDS = int(os.environ.get("RESULT_CACHE_MAX_RECORDS", "2000000"))
+RESULT_CACHE_TTL = float(os.environ.get("RESULT_CACHE_TTL", "3600"))
+
+# Comparison worker threads per process and how many more requests may wait for
+# one before /compare answers 503 (COMPARE_WORKERS=0 computes on the event loop)
+COMPARE_WORKERS = int(os.environ.get("COMPARE_WORKERS", "4"))
+COMPARE_QUEUE_DEPTH = int(os.environ.get("COMPARE_QUEUE_DEPTH", "64"))
+
+# Admission control (see admission.py): cost is the estimated compute time in ms
+# from the list sizes and options. Above MAX_COST -> 413; above HEAVY_COST a request
+# needs one of MAX_HEAVY slots per worker, waiting up to HEAVY_WAIT seconds -> 429
+ADMISSION_MAX_COST = int(os.environ.get("ADMISSION_MAX_COST", "1000"))
+ADMISSION_HEAVY_COST = int(os.environ.get("ADMISSION_HEAVY_COST", "250"))
+ADMISSION_MAX_HEAVY = int(os.environ.get("ADMISSION_MAX_HEAVY", "2"))
+ADMISSION_HEAVY_WAIT = float(os.environ.get("ADMISSION_HEAVY_WAIT", "0"))
+# Request bodies above this are refused before they are parsed
+MAX_REQUEST_BYTES = int(os.environ.get("MAX_REQUEST_BYTES", str(10 * 1024 * 1024)))
+
+# Hot reload: check table versions (or the data plane's `current` link) every
+# RELOAD_INTERVAL seconds (0 = never), and/or on POST /reload with the
+# X-Reload-Token header equal to RELOAD_TOKEN (unset = endpoint disabled).
+# Without DATA_PLANE_DIR every worker holds its own copy, so /reload only
+# reloads the worker that receives it and the others catch up at their next
+# RELOAD_INTERVAL check (never, if it is 0). With a data plane it refreshes the
+# shared plane and every worker re-attaches; use one with `--workers N`.
+RELOAD_INTERVAL = float(os.environ.get("RELOAD_INTERVAL", "0"))
+RELOAD_TOKEN = os.environ.get("RELOAD_TOKEN")
+
+# Where /compare and /compare/stream run: "memory" (startup-built indexes, the
+# default) or "sql" (one query per request against the database, no tables held
+# in RAM; see comparison_backends.py for what it covers). /compare/batch and
+# /reload need the in-memory indexes.
+COMPARE_BACKEND = os.environ.get("COMPARE_BACKEND", "memory")
 
 # --- DATA STORAGE ---
-gene_info_df = None
-go_terms_map_df = None
-ensembl_to_go_df = None
+# Read-only indexes shared by every request (see reference.ReferenceData). A
+# reload builds a complete new one and swaps this single name; requests hold on
+# to the one they started with, so in-flight work drains on the old snapshot.
+reference = None
+# What `reference` was built from: table versions, plus the frames themselves
+# when hot reload is enabled so unchanged tables need not be read again
+reference_versions = {}
+reference_frames = {}
+reference_loaded_at = None
+reload_lock = threading.Lock()
+# Set instead of `reference` when COMPARE_BACKEND=sql
+sql_backend = None
+# Finished /compare results, emptied whenever a different reference is served
+result_cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_MAX_RECORDS, RESULT_CACHE_TTL)
+# Runs the CPU-bound comparison and encoding off the event loop
+compute_pool = ComputePool(COMPARE_WORKERS, COMPARE_QUEUE_DEPTH)
+# Per-request size budgets and the cap on concurrent heavy requests
+admission = AdmissionControl(ADMISSION_MAX_COST, ADMISSION_HEAVY_COST, ADMISSION_MAX_HEAVY, ADMISSION_HEAVY_WAIT)
+
+def ppi_version():
+    return f"mtime:{os.path.getmtime(PPI_DATA_PATH)}" if os.path.exists(PPI_DATA_PATH) else "missing"
+
+def load_reference_frames(previous=None, deltas=None):
+    # Create engine with proper SQLAlchemy format
+    engine = create_engine(DATABASE_URL)
+
+    # Load data from Supabase tables (or the local snapshot cache)
+    frames, versions = load_tables(engine, DATA_SNAPSHOT_DIR, previous, deltas)
+    versions['filtered_biogrid'] = ppi_version()
+    print("✅ Data loading from Supabase complete.")
+    return frames, versions
+
+def build_reference(frames):
+    biogrid_df = read_biogrid_tsv(PPI_DATA_PATH)
+    if biogrid_df is None:
+        print(f"-> WARNING: {PPI_DATA_PATH} not found. PPI analysis will be empty.")
+
+    # Build the read-only gene universe, GO term and gene -> GO indexes used by /compare
+    start = time.perf_counter()
+    built = ReferenceData.build(frames['genes'], frames['go_terms'], frames['ensembl_to_go'],
+                                go_parents_df=frames.get('go_parents'), biogrid_df=biogrid_df)
+    print(f"✅ Indexes built: {built.describe()} in {time.perf_counter() - start:.2f}s.")
+    return built
+
+def load_reference_data():
+    frames, versions = load_reference_frames()
+    return build_reference(frames), versions
+
+def reload_enabled():
+    return RELOAD_INTERVAL > 0 or bool(RELOAD_TOKEN)
+
+def install_reference(built, versions, frames=None):
+    global reference, reference_versions, reference_frames, reference_loaded_at
+    reference_versions = versions
+    reference_frames = frames if frames is not None and reload_enabled() else {}
+    reference_loaded_at = time.time()
+    reference = built
+
+# --- HOT RELOAD ---
+def reload_reference_data(rebuild=True, min_interval=0.0):
+    """Swap in a new snapshot if the source data changed; returns whether it did.
+
+    Blocking: run it off the event loop. With a data plane, ``rebuild`` first
+    refreshes the shared plane from the database (see refresh_data_plane for
+    ``min_interval``), then this worker re-attaches if `current` moved, as the
+    others do from watch_data_plane. Otherwise only the tables whose version
+    changed are re-read and the indexes rebuilt.
+    """
+    if not reload_lock.acquire(blocking=False):
+        if rebuild:
+            print("-> Reload already in progress, skipping.")
+        return False
+    try:
+        if DATA_PLANE_DIR:
+            if rebuild:
+                refresh_data_plane(DATA_PLANE_DIR, load_reference_frames, build_reference, min_interval)
+            if current_plane_name(DATA_PLANE_DIR) == reference_versions.get('plane'):
+                return False
+            built, manifest = attach_data_plane(DATA_PLANE_DIR)
+            install_reference(built, {**manifest['versions'], 'plane': manifest['plane']})
+            print(f"✅ Re-attached to data plane {manifest['plane']}: {built.describe()}.")
+            return True
+
+        previous = (reference_frames, reference_versions) if reference_frames else None
+        deltas = {}
+        frames, versions = load_reference_frames(previous, deltas)
+        if versions == reference_versions:
+            return False
+        changed = sorted(table for table in versions if versions[table] != reference_versions.get(table))
+        print(f"Reloading reference data, changed: {', '.join(changed)}...")
+        built = None
+        if changed == ['ensembl_to_go'] and 'ensembl_to_go' in deltas:
+            # Only annotations changed: rebuild just the touched genes' rows
+            built = reference.with_annotations(frames['ensembl_to_go'], deltas['ensembl_to_go'])
+        install_reference(built or build_reference(frames), versions, frames)
+        print("✅ Reference data reloaded.")
+        return True
+    finally:
+        reload_lock.release()
+
+async def reload_periodically():
+    while True:
+        await asyncio.sleep(RELOAD_INTERVAL)
+        try:
+            # Default executor, so a rebuild never takes a comparison worker.
+            # With a data plane, one worker per interval checks the database.
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: reload_reference_data(min_interval=RELOAD_INTERVAL / 2))
+        except Exception as e:
+            print(f"❌ Reload failed, still serving the previous snapshot: {e}")
+
+async def watch_data_plane():
+    # Picks up planes published by another worker's reload or `python data_plane.py`
+    while True:
+        await asyncio.sleep(DATA_PLANE_POLL_INTERVAL)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, lambda: reload_reference_data(rebuild=False))
+        except Exception as e:
+            print(f"❌ Re-attaching to the data plane failed, still serving the previous snapshot: {e}")
 
 # --- SETUP: LOAD DATA FROM SUPABASE ON STARTUP ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global sql_backend
     print("Server starting up...")
-    print("Loading data from Supabase...")
 
-    global gene_info_df, go_terms_map_df, ensembl_to_go_df
-    
     try:
-        # Create engine with proper SQLAlchemy format
-        engine = create_engine(DATABASE_URL)
-        
-        # Load data from Supabase tables
-        gene_info_df = pd.read_sql_table('genes', engine)
-        go_terms_map_df = pd.read_sql_table('go_terms', engine)
-        ensembl_to_go_df = pd.read_sql_table('ensembl_to_go', engine)
-        
-        # Data cleaning and uppercase conversion for consistent matching
-        if 'gene_symbol' in gene_info_df.columns:
-            gene_info_df['gene_symbol'] = gene_info_df['gene_symbol'].str.upper()
-        
-        print("✅ Data loading from Supabase complete.")
+        if COMPARE_BACKEND == "sql":
+            sql_backend = SqlBackend(create_engine(DATABASE_URL))
+            print("✅ Comparisons will run in the database (COMPARE_BACKEND=sql).")
+        elif DATA_PLANE_DIR:
+            print(f"Attaching to data plane at {DATA_PLANE_DIR}...")
+            built, manifest = ensure_data_plane(DATA_PLANE_DIR, load_reference_data)
+            install_reference(built, {**manifest['versions'], 'plane': manifest['plane']})
+            print(f"✅ Attached to data plane: {reference.describe()}.")
+        else:
+            print("Loading data from Supabase...")
+            frames, versions = load_reference_frames()
+            install_reference(build_reference(frames), versions, frames)
         
     except Exception as e:
         print(f"❌ Error loading data from Supabase: {e}")
         raise e
 
+    tasks = []
+    if sql_backend is None and RELOAD_INTERVAL > 0:
+        tasks.append(asyncio.create_task(reload_periodically()))
+    if sql_backend is None and DATA_PLANE_DIR:
+        tasks.append(asyncio.create_task(watch_data_plane()))
     print("Server is ready.")
     yield
     print("Server shutting down...")
+    for task in tasks:
+        task.cancel()
+    compute_pool.shutdown()
 
 # --- INITIALIZE FASTAPI APP ---
 app = FastAPI(lifespan=lifespan)
@@ -68,6 +254,14 @@ app.mount("/static", StaticFiles(directory="."), name="static")
 async def serve_frontend():
     return FileResponse("index.html")
 
+# Refuse oversized bodies up front, before a huge ID list is parsed into memory
+@app.middleware("http")
+async def limit_request_size(request: Request, call_next):
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_REQUEST_BYTES:
+        return JSONResponse(status_code=413, content={"detail": f"Request body exceeds {MAX_REQUEST_BYTES} bytes"})
+    return await call_next(request)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -81,57 +275,189 @@ app.add_middleware(
 class GeneLists(BaseModel):
     up_regulated: list[str]
     down_regulated: list[str]
+    # Adds hypergeometric GO enrichment (with BH FDR) for each list
+    enrichment: bool = False
+    # Propagates annotations to ancestor GO terms (is_a / part_of) before comparing
+    propagate: bool = False
 
 # --- API ENDPOINT ---
+def normalise_ids(ids):
+    ids = {s.strip().upper() for s in ids if s.strip()}
+    # Lookups use fixed-width arrays, so a single huge token would size them all
+    oversized = next((s for s in ids if len(s) > MAX_IDENTIFIER_LENGTH), None)
+    if oversized is not None:
+        raise HTTPException(status_code=422,
+                            detail=f"Identifier '{oversized[:20]}...' is longer than {MAX_IDENTIFIER_LENGTH} characters")
+    return ids
+
+def pool_full_error():
+    return HTTPException(status_code=503, detail="Server busy, please try again shortly",
+                         headers={"Retry-After": "1"})
+
+async def run_in_pool(job):
+    try:
+        return await compute_pool.run(job)
+    except PoolFull:
+        raise pool_full_error()
+
+@asynccontextmanager
+async def admitted(cost):
+    try:
+        async with admission.admit(cost):
+            yield
+    except TooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Overloaded as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def reference_or_error():
+    current = reference
+    if current is None:
+        if sql_backend is not None:
+            raise HTTPException(status_code=501, detail="Not available with COMPARE_BACKEND=sql")
+        raise HTTPException(status_code=503, detail="Service starting up, please try again in a moment")
+    return current
+
+async def release_after(lines, stack):
+    # Keeps the stream's admission slot until the last line is sent
+    try:
+        async for line in lines:
+            yield line
+    finally:
+        await stack.aclose()
+
 @app.post("/compare")
-async def compare_gene_lists(lists: GeneLists):
-    if gene_info_df is None or go_terms_map_df is None or ensembl_to_go_df is None:
+async def compare_gene_lists(lists: GeneLists, request: Request):
+    current = reference
+    backend = sql_backend or (InMemoryBackend(current) if current is not None else None)
+    if backend is None:
         raise HTTPException(status_code=503, detail="Service starting up, please try again in a moment")
     
-    ensembl_ids_a = {s.strip().upper() for s in lists.up_regulated if s.strip()}
-    ensembl_ids_b = {s.strip().upper() for s in lists.down_regulated if s.strip()}
+    ensembl_ids_a = normalise_ids(lists.up_regulated)
+    ensembl_ids_b = normalise_ids(lists.down_regulated)
 
     if not ensembl_ids_a and not ensembl_ids_b:
         raise HTTPException(status_code=400, detail="Both gene lists are empty")
 
-    db_ensembl_ids = set(gene_info_df['ensembl_gene_id'].dropna())
-    mapped_a_count = len(ensembl_ids_a.intersection(db_ensembl_ids))
-    mapped_b_count = len(ensembl_ids_b.intersection(db_ensembl_ids))
+    key = fingerprint(ensembl_ids_a, ensembl_ids_b, lists.enrichment, lists.propagate)
+    # Programmatic clients can ask for Arrow record batches instead of JSON;
+    # either way it is returned as a Response so FastAPI skips jsonable_encoder
+    response_class = ArrowStreamResponse if accepts_arrow(request.headers.get("accept")) else FastJSONResponse
 
-    go_a = ensembl_to_go_df[ensembl_to_go_df['ensembl_gene_id'].isin(ensembl_ids_a)]
-    go_b = ensembl_to_go_df[ensembl_to_go_df['ensembl_gene_id'].isin(ensembl_ids_b)]
-    
-    go_set_a = set(go_a['go_id'])
-    go_set_b = set(go_b['go_id'])
-    
-    unique_go_a_ids = list(go_set_a - go_set_b)
-    unique_go_b_ids = list(go_set_b - go_set_a)
-    shared_go_ids = list(go_set_a & go_set_b)
-
-    def get_terms_from_ids(id_list):
-        if not id_list: return []
-        terms = go_terms_map_df[go_terms_map_df['GO_ID'].isin(id_list)]
-        return terms.rename(columns={'GO_ID': 'id', 'GO_Term': 'term'}).to_dict('records')
-
-    symbols_a = set(gene_info_df[gene_info_df['ensembl_gene_id'].isin(ensembl_ids_a)]['gene_symbol'])
-    symbols_b = set(gene_info_df[gene_info_df['ensembl_gene_id'].isin(ensembl_ids_b)]['gene_symbol'])
-
-    return {
-        "summary": {
-            "up_regulated_submitted_count": len(ensembl_ids_a),
-            "down_regulated_submitted_count": len(ensembl_ids_b),
-            "up_regulated_mapped_count": mapped_a_count,
-            "down_regulated_mapped_count": mapped_b_count,
-        },
-        "go_comparison": {
-            "unique_to_up_regulated": get_terms_from_ids(unique_go_a_ids),
-            "unique_to_down_regulated": get_terms_from_ids(unique_go_b_ids),
-            "shared": get_terms_from_ids(shared_go_ids)
-        },
-        "gene_symbols": {
-            "up_regulated": list(symbols_a),
-            "down_regulated": list(symbols_b)
-        }
-    }
+    def compare_and_encode():
+        # SQL results always come fresh from the database
+        result = result_cache.get(current, key) if current is not None else None
+        if result is None:
+            result = backend.compare(ensembl_ids_a, ensembl_ids_b,
+                                     enrichment=lists.enrichment, propagate=lists.propagate)
+            if current is not None:
+                result_cache.put(current, key, result)
+        return response_class(result)
+
+    async with admitted(request_cost(ensembl_ids_a, ensembl_ids_b, lists.enrichment, lists.propagate)):
+        try:
+            return await run_in_pool(compare_and_encode)
+        except Unsupported as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+# Streams the same result as NDJSON, each section sent as soon as it is computed
+@app.post("/compare/stream")
+async def compare_gene_lists_stream(lists: GeneLists):
+    current = reference
+    if current is None and sql_backend is None:
+        raise HTTPException(status_code=503, detail="Service starting up, please try again in a moment")
+
+    ensembl_ids_a = normalise_ids(lists.up_regulated)
+    ensembl_ids_b = normalise_ids(lists.down_regulated)
+
+    if not ensembl_ids_a and not ensembl_ids_b:
+        raise HTTPException(status_code=400, detail="Both gene lists are empty")
+    if sql_backend is not None:
+        # Refuse before the stream starts rather than fail half-way through it
+        try:
+            sql_backend.check(lists.enrichment, lists.propagate)
+        except Unsupported as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    key = fingerprint(ensembl_ids_a, ensembl_ids_b, lists.enrichment, lists.propagate)
+
+    def sections():
+        # Runs on the compute pool as the response is sent; the finished
+        # result is cached like a /compare one
+        if sql_backend is not None:
+            # One query answers every section, which are then sent in turn
+            yield from sql_backend.compare(ensembl_ids_a, ensembl_ids_b).items()
+            return
+        cached = result_cache.get(current, key)
+        if cached is not None:
+            yield from cached.items()
+            return
+        view_a = GeneListView(ensembl_ids_a, current, lists.propagate)
+        view_b = GeneListView(ensembl_ids_b, current, lists.propagate)
+        result = {}
+        for name, section in comparison_sections(view_a, view_b, current, lists.enrichment):
+            result[name] = section
+            yield name, section
+        result_cache.put(current, key, result)
+
+    stack = AsyncExitStack()
+    cost = request_cost(ensembl_ids_a, ensembl_ids_b, lists.enrichment, lists.propagate)
+    await stack.enter_async_context(admitted(cost))
+    try:
+        lines = compute_pool.iterate(ndjson_lines(sections()))
+    except PoolFull:
+        await stack.aclose()
+        raise pool_full_error()
+    return StreamingResponse(release_after(lines, stack), media_type="application/x-ndjson")
+
+# Evaluates many contrasts against the same indexes in one call; results keep input order
+@app.post("/compare/batch")
+async def compare_gene_list_batch(batch: list[GeneLists]):
+    current = reference_or_error()
+
+    contrasts = []
+    for i, lists in enumerate(batch):
+        ensembl_ids_a = normalise_ids(lists.up_regulated)
+        ensembl_ids_b = normalise_ids(lists.down_regulated)
+        if not ensembl_ids_a and not ensembl_ids_b:
+            raise HTTPException(status_code=400, detail=f"Both gene lists are empty in contrast {i}")
+        contrasts.append((ensembl_ids_a, ensembl_ids_b, lists.enrichment, lists.propagate))
+
+    def compare_and_encode():
+        # Serve cached contrasts directly and evaluate the rest together
+        keys = [fingerprint(*contrast) for contrast in contrasts]
+        results = [result_cache.get(current, key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        for i, result in zip(missing, compare_gene_set_batch([contrasts[i] for i in missing], current)):
+            results[i] = result
+            result_cache.put(current, keys[i], result)
+        return FastJSONResponse(results)
+
+    cost = sum(request_cost(ids_a, ids_b, enrichment, propagate)
+               for ids_a, ids_b, enrichment, propagate in contrasts)
+    async with admitted(cost):
+        return await run_in_pool(compare_and_encode)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return result_cache.stats()
+
+@app.get("/snapshot")
+async def snapshot_info():
+    current = reference
+    return {"loaded": current is not None, "description": current.describe() if current else None,
+            "versions": reference_versions, "loaded_at": reference_loaded_at}
 
+@app.post("/reload")
+async def reload_reference(request: Request):
+    if not RELOAD_TOKEN or request.headers.get("x-reload-token") != RELOAD_TOKEN:
+        raise HTTPException(status_code=403, detail="Reload is disabled or the token is wrong")
+    if sql_backend is not None:
+        raise HTTPException(status_code=501, detail="Not available with COMPARE_BACKEND=sql")
+    # Built on the default executor; live requests keep using the old snapshot meanwhile
+    reloaded = await asyncio.get_running_loop().run_in_executor(None, reload_reference_data)
+    return {"reloaded": reloaded, "versions": reference_versions}
 
+@app.get("/pool/stats")
+async def pool_stats():
+    return {**compute_pool.stats(), "admission": admission.stats()}
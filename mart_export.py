@@ -0,0 +1,90 @@
+import pandas as pd
+
+# --- SINGLE-PASS BIOMART EXPORT INGESTION ---
+# mart_export.txt.gz is decompressed and parsed once, in fixed-size chunks, and
+# every derived table takes what it needs from each chunk as it goes by. Peak
+# memory is one chunk plus whatever state a derived table keeps (gene_map.tsv
+# remembers the distinct gene/symbol pairs it has written).
+
+MART_COLUMNS = {
+    'Gene stable ID': 'ensembl_gene_id',
+    'GO term accession': 'go_id',
+    'Gene name': 'gene_symbol',
+}
+CHUNK_ROWS = 500_000
+
+class DerivedTable:
+    """One TSV written from the mart export; subclasses pick rows per chunk."""
+
+    columns = ()
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._file = None
+
+    def select(self, chunk):
+        raise NotImplementedError
+
+    def write(self, chunk):
+        rows = self.select(chunk)
+        if self._file is None:
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+            rows.to_csv(self._file, sep='\t', index=False)
+        else:
+            rows.to_csv(self._file, sep='\t', index=False, header=False)
+        self.rows += len(rows)
+
+    def close(self):
+        if self._file is None:
+            # No chunk reached us: still leave a header-only file behind
+            pd.DataFrame(columns=list(self.columns)).to_csv(self.path, sep='\t', index=False)
+        else:
+            self._file.close()
+
+class EnsemblToGo(DerivedTable):
+    columns = ('ensembl_gene_id', 'go_id')
+
+    def select(self, chunk):
+        # Drop any rows where GO ID is missing
+        return chunk[list(self.columns)].dropna(subset=['go_id'])
+
+class GeneMap(DerivedTable):
+    columns = ('ensembl_gene_id', 'gene_symbol')
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._seen = set()
+
+    def select(self, chunk):
+        pairs = chunk[list(self.columns)].dropna().drop_duplicates()
+        keys = pairs['ensembl_gene_id'] + '\t' + pairs['gene_symbol']
+        new = ~keys.isin(self._seen)
+        self._seen.update(keys[new])
+        return pairs[new]
+
+def ingest_mart_export(path, tables, chunk_rows=CHUNK_ROWS):
+    """Stream the export once into every derived table; returns the tables written."""
+    header = pd.read_csv(path, sep='\t', nrows=0).columns
+    available = {MART_COLUMNS[column] for column in header if column in MART_COLUMNS}
+    writable = []
+    for table in tables:
+        missing = set(table.columns) - available
+        if missing:
+            print(f"-> WARNING: export lacks {sorted(missing)}; skipping {table.path}.")
+        else:
+            writable.append(table)
+
+    source_columns = [column for column in header if MART_COLUMNS.get(column) in
+                      {name for table in writable for name in table.columns}]
+    chunks = pd.read_csv(path, sep='\t', usecols=source_columns, dtype=str,
+                         chunksize=chunk_rows)
+    try:
+        for chunk in chunks:
+            chunk = chunk.rename(columns=MART_COLUMNS)
+            for table in writable:
+                table.write(chunk)
+    finally:
+        for table in writable:
+            table.close()
+    return writable
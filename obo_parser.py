@@ -0,0 +1,83 @@
+import csv
+from typing import NamedTuple
+import pandas as pd
+
+# --- STREAMING GO-BASIC.OBO PARSER ---
+# Yields one record per [Term] stanza while reading the file line by line. Only
+# the tags the pipeline uses are looked at; every other line is skipped with a
+# prefix check, without stripping or splitting it. [Typedef] and [Instance]
+# stanzas are skipped as a whole instead of being merged into the previous term.
+
+class OboTerm(NamedTuple):
+    go_id: str
+    name: str
+    namespace: str
+    is_obsolete: bool
+    # ((parent_go_id, relation), ...) for is_a and part_of edges
+    parents: tuple
+
+def iter_obo_terms(lines, include_obsolete=True):
+    """Yield an OboTerm for every [Term] stanza in ``lines`` (an open file or any line iterable)."""
+    in_term = False
+    go_id = name = namespace = None
+    is_obsolete = False
+    parents = []
+
+    for line in lines:
+        first = line[:1]
+        if first == '[':
+            if go_id is not None and (include_obsolete or not is_obsolete):
+                yield OboTerm(go_id, name or '', namespace or '', is_obsolete, tuple(parents))
+            in_term = line.startswith('[Term]')
+            go_id = name = namespace = None
+            is_obsolete = False
+            parents = []
+        elif not in_term:
+            continue
+        # Dispatch on the first character so def/synonym/xref/comment lines,
+        # the bulk of the file, cost a single comparison
+        elif first == 'i':
+            if line.startswith('id: '):
+                go_id = line[4:].rstrip()
+            elif line.startswith('is_a: '):
+                # "is_a: GO:0048308 ! organelle inheritance"
+                parents.append((line[6:].split(' ', 1)[0].rstrip(), 'is_a'))
+            elif line.startswith('is_obsolete: true'):
+                is_obsolete = True
+        elif first == 'n':
+            if line.startswith('name: '):
+                name = line[6:].rstrip()
+            elif line.startswith('namespace: '):
+                namespace = line[11:].rstrip()
+        elif first == 'r' and line.startswith('relationship: part_of '):
+            # "relationship: part_of GO:0005829 ! cytosol"
+            parents.append((line[22:].split(' ', 1)[0].rstrip(), 'part_of'))
+
+    if in_term and go_id is not None and (include_obsolete or not is_obsolete):
+        yield OboTerm(go_id, name or '', namespace or '', is_obsolete, tuple(parents))
+
+def write_go_tables(obo_path, go_terms_path, go_parents_path):
+    """Stream go-basic.obo straight into go_terms.tsv and go_parents.tsv; returns the term count."""
+    n_terms = 0
+    with open(obo_path, 'r', encoding='utf-8') as obo, \
+            open(go_terms_path, 'w', newline='', encoding='utf-8') as terms_file, \
+            open(go_parents_path, 'w', newline='', encoding='utf-8') as parents_file:
+        terms_writer = csv.writer(terms_file, delimiter='\t', lineterminator='\n')
+        parents_writer = csv.writer(parents_file, delimiter='\t', lineterminator='\n')
+        terms_writer.writerow(['GO_ID', 'GO_Term', 'namespace', 'is_obsolete'])
+        parents_writer.writerow(['go_id', 'parent_go_id', 'relation'])
+        for term in iter_obo_terms(obo):
+            terms_writer.writerow([term.go_id, term.name, term.namespace, term.is_obsolete])
+            parents_writer.writerows((term.go_id, parent, relation) for parent, relation in term.parents)
+            n_terms += 1
+    return n_terms
+
+def parse_obo(file_path):
+    """Return ``(go_terms_df, go_parents_df)`` for callers that want DataFrames."""
+    go_terms, go_parents = [], []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for term in iter_obo_terms(f):
+            go_terms.append((term.go_id, term.name, term.namespace, term.is_obsolete))
+            go_parents.extend((term.go_id, parent, relation) for parent, relation in term.parents)
+    return (pd.DataFrame(go_terms, columns=['GO_ID', 'GO_Term', 'namespace', 'is_obsolete']),
+            pd.DataFrame(go_parents, columns=['go_id', 'parent_go_id', 'relation']))
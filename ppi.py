@@ -0,0 +1,107 @@
+import os
+import numpy as np
+import pandas as pd
+from indexes import csr_from_pairs, freeze, gather_csr_pairs, sorted_unique, unique_pairs
+
+# --- PROTEIN-PROTEIN INTERACTION INDEX ---
+# Physical interactions from filtered_biogrid.tsv as a symmetric CSR adjacency
+# over the shared gene axis. Interactors are matched to genes by Entrez ID when
+# the genes table carries one, otherwise by official symbol; a key shared by
+# several Ensembl genes resolves to the first of them. A query only touches the
+# adjacency rows of the submitted genes, so its cost follows their degrees.
+
+SYMBOL_A = 'Official Symbol Interactor A'
+SYMBOL_B = 'Official Symbol Interactor B'
+ENTREZ_A = 'Entrez Gene Interactor A'
+ENTREZ_B = 'Entrez Gene Interactor B'
+
+def read_biogrid_tsv(path):
+    if not path or not os.path.exists(path):
+        return None
+    return pd.read_csv(path, sep='\t', usecols=lambda column: column in (SYMBOL_A, SYMBOL_B, ENTREZ_A, ENTREZ_B),
+                       dtype='string')
+
+def _key_codes(keys, table_keys, table_genes):
+    # Map interactor keys to gene codes via a first-wins lookup table
+    lookup = pd.Series(table_genes, index=table_keys)
+    lookup = lookup[~lookup.index.duplicated(keep='first')]
+    return pd.Series(keys).map(lookup).fillna(-1).astype(np.int64).to_numpy()
+
+class PpiIndex:
+    def __init__(self, offsets, indices):
+        self.offsets = offsets
+        self.indices = indices
+        freeze(offsets, indices)
+
+    @classmethod
+    def from_frame(cls, biogrid_df, gene_universe):
+        n_genes = len(gene_universe)
+        if biogrid_df is None or biogrid_df.empty:
+            return cls.from_edges(np.array([], dtype=np.int64), np.array([], dtype=np.int64), n_genes)
+
+        row_genes = gene_universe.row_genes()
+        codes = []
+        for entrez_column, symbol_column in ((ENTREZ_A, SYMBOL_A), (ENTREZ_B, SYMBOL_B)):
+            side = np.full(len(biogrid_df), -1, dtype=np.int64)
+            if entrez_column in biogrid_df.columns:
+                has_entrez = gene_universe.entrez_ids > 0
+                entrez = pd.to_numeric(biogrid_df[entrez_column], errors='coerce').fillna(0).astype(np.int64)
+                side = _key_codes(entrez.to_numpy(), gene_universe.entrez_ids[has_entrez], row_genes[has_entrez])
+            if symbol_column in biogrid_df.columns:
+                has_symbol = gene_universe.symbols != ''
+                symbols = biogrid_df[symbol_column].str.upper().to_numpy(dtype=object)
+                by_symbol = _key_codes(symbols, gene_universe.symbols[has_symbol], row_genes[has_symbol])
+                side = np.where(side >= 0, side, by_symbol)
+            codes.append(side)
+
+        keep = (codes[0] >= 0) & (codes[1] >= 0)
+        return cls.from_edges(codes[0][keep], codes[1][keep], n_genes)
+
+    @classmethod
+    def from_edges(cls, genes_a, genes_b, n_genes):
+        # Store every interaction in both directions, once
+        rows, values = unique_pairs(np.concatenate([genes_a, genes_b]), np.concatenate([genes_b, genes_a]), n_genes)
+        offsets, indices = csr_from_pairs(rows, values, n_genes)
+        return cls(offsets, indices)
+
+    def to_arrays(self):
+        return {'offsets': self.offsets, 'indices': self.indices}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays['offsets'], arrays['indices'])
+
+    @property
+    def n_interactions(self):
+        # Each undirected edge is stored twice, self-interactions once
+        rows = np.repeat(np.arange(len(self.offsets) - 1), np.diff(self.offsets))
+        return int((rows < self.indices).sum() + (rows == self.indices).sum())
+
+    def edges_between(self, gene_codes_a, gene_codes_b, same_list=False):
+        """Interactions from a gene in ``gene_codes_a`` to one in ``gene_codes_b``.
+
+        With ``same_list`` each undirected edge is reported once. Returns two
+        aligned arrays of gene codes.
+        """
+        sources = sorted_unique(gene_codes_a[gene_codes_a >= 0])
+        targets = sorted_unique(gene_codes_b[gene_codes_b >= 0])
+        rows, neighbours = gather_csr_pairs(self.offsets, self.indices, sources)
+        if len(targets) == 0:
+            return rows[:0], neighbours[:0]
+        position = np.minimum(np.searchsorted(targets, neighbours), len(targets) - 1)
+        hit = targets[position] == neighbours
+        if same_list:
+            hit &= rows <= neighbours
+        return rows[hit], neighbours[hit].astype(np.int64)
+
+    def analysis(self, gene_codes_a, gene_codes_b, gene_universe):
+        def records(edges):
+            genes_a, genes_b = edges
+            return [{SYMBOL_A: symbol_a, SYMBOL_B: symbol_b} for symbol_a, symbol_b in
+                    zip(gene_universe.display_symbols(genes_a), gene_universe.display_symbols(genes_b))]
+
+        return {
+            "internal_up_regulated": records(self.edges_between(gene_codes_a, gene_codes_a, same_list=True)),
+            "cross_talk": records(self.edges_between(gene_codes_a, gene_codes_b)),
+            "internal_down_regulated": records(self.edges_between(gene_codes_b, gene_codes_b, same_list=True)),
+        }
@@ -0,0 +1,84 @@
+from enrichment import EnrichmentBackground
+from go_dag import GoDag
+from identifiers import IdentifierIndex
+from indexes import GeneGoIndex, GeneUniverse, GoTermIndex
+from ppi import PpiIndex
+
+
+# --- REFERENCE DATA ---
+class ReferenceData:
+    """Every startup-built index /compare reads, bundled as one read-only unit.
+
+    The indexes are plain numpy arrays, so the whole bundle can be flattened to
+    named arrays (see data_plane.py) and re-attached without rebuilding.
+    """
+
+    def __init__(self, gene_universe, go_term_index, gene_go_index, go_dag, ppi_index, identifier_index):
+        self.gene_universe = gene_universe
+        self.go_term_index = go_term_index
+        self.gene_go_index = gene_go_index
+        self.go_dag = go_dag
+        self.ppi_index = ppi_index
+        self.identifier_index = identifier_index
+        # Derived from the CSR indexes in a few vectorized passes, so not persisted
+        self.enrichment_background = EnrichmentBackground.from_indexes(gene_universe, gene_go_index)
+        self.propagated_enrichment_background = self.enrichment_background
+        if go_dag.n_edges:
+            self.propagated_enrichment_background = EnrichmentBackground.from_indexes(
+                gene_universe, gene_go_index, go_dag)
+
+    @classmethod
+    def build(cls, gene_info_df, go_terms_map_df, ensembl_to_go_df, go_parents_df=None, biogrid_df=None):
+        # Data cleaning and uppercase conversion for consistent matching
+        if 'gene_symbol' in gene_info_df.columns:
+            gene_info_df = gene_info_df.assign(gene_symbol=gene_info_df['gene_symbol'].str.upper())
+
+        gene_universe = GeneUniverse.from_frame(gene_info_df, ensembl_to_go_df['ensembl_gene_id'])
+        go_term_index = GoTermIndex.from_frame(go_terms_map_df, ensembl_to_go_df['go_id'])
+        gene_go_index = GeneGoIndex.from_frame(
+            ensembl_to_go_df, gene_ids=gene_universe.gene_ids, go_ids=go_term_index.go_ids)
+        go_dag = GoDag.from_frame(go_parents_df, go_term_index.go_ids)
+        ppi_index = PpiIndex.from_frame(biogrid_df, gene_universe)
+        identifier_index = IdentifierIndex.from_frame(gene_info_df, gene_universe)
+        return cls(gene_universe, go_term_index, gene_go_index, go_dag, ppi_index, identifier_index)
+
+    def with_annotations(self, ensembl_to_go_df, ensembl_ids):
+        """Copy with the GO annotations of ``ensembl_ids`` re-read from ``ensembl_to_go_df``.
+
+        Only those genes' CSR rows are rebuilt; the other indexes are shared.
+        Returns None when the change needs a new gene or GO code (a full build).
+        """
+        gene_go_index = self.gene_go_index.with_rows(ensembl_to_go_df, ensembl_ids)
+        if gene_go_index is None:
+            return None
+        return ReferenceData(self.gene_universe, self.go_term_index, gene_go_index, self.go_dag,
+                             self.ppi_index, self.identifier_index)
+
+    def to_arrays(self):
+        arrays = {}
+        for prefix, index in (('genes', self.gene_universe), ('go_terms', self.go_term_index),
+                              ('gene_go', self.gene_go_index), ('go_dag', self.go_dag),
+                              ('ppi', self.ppi_index), ('ids', self.identifier_index)):
+            arrays.update({f"{prefix}.{name}": array for name, array in index.to_arrays().items()})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        def section(prefix):
+            return {name.split('.', 1)[1]: array for name, array in arrays.items()
+                    if name.startswith(f"{prefix}.")}
+
+        gene_universe = GeneUniverse.from_arrays(section('genes'))
+        go_term_index = GoTermIndex.from_arrays(section('go_terms'))
+        gene_go_index = GeneGoIndex.from_arrays(
+            section('gene_go'), gene_universe.gene_ids, go_term_index.go_ids)
+        go_dag = GoDag.from_arrays(section('go_dag'))
+        ppi_index = PpiIndex.from_arrays(section('ppi'))
+        identifier_index = IdentifierIndex.from_arrays(section('ids'))
+        return cls(gene_universe, go_term_index, gene_go_index, go_dag, ppi_index, identifier_index)
+
+    def describe(self):
+        return (f"{len(self.gene_universe)} genes, {len(self.go_term_index)} GO terms, "
+                f"{self.gene_go_index.nnz} annotations, {self.go_dag.n_edges} GO DAG edges, "
+                f"{self.ppi_index.n_interactions} protein interactions, "
+                f"{len(self.identifier_index)} symbol / Entrez / alias keys")
@@ -0,0 +1,104 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# --- /compare RESULT CACHE ---
+# Users resubmit the same lists (example sets, notebook reruns), so finished
+# /compare results are kept in a small LRU keyed by a fingerprint of the
+# normalised request. Entries expire after a TTL. The cache is bound to the
+# ReferenceData it was filled from and empties itself when another snapshot is
+# served. Memory is bounded by entry count and by the number of records
+# (GO terms, symbols, interactions) held across all entries.
+
+def fingerprint(ensembl_ids_a, ensembl_ids_b, enrichment=False, propagate=False):
+    """Canonical hash of an already upper-cased, de-duplicated /compare request."""
+    digest = hashlib.blake2b(digest_size=16)
+    for ids in (ensembl_ids_a, ensembl_ids_b):
+        digest.update('\n'.join(sorted(ids)).encode())
+        digest.update(b'\0')
+    digest.update(f"enrichment={bool(enrichment)};propagate={bool(propagate)}".encode())
+    return digest.hexdigest()
+
+def result_records(result):
+    """Number of records in a /compare result, used as its cache weight."""
+    sections = [result.get(name, {}) for name in ('go_comparison', 'gene_symbols', 'ppi_analysis', 'enrichment')]
+    return 1 + sum(len(value) for section in sections for value in section.values()
+                   if not isinstance(value, (int, float)))
+
+
+class ResultCache:
+    def __init__(self, max_entries=256, max_records=2_000_000, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.max_records = max_records
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()  # key -> (expires_at, records, result)
+        self.records = 0
+        self.reference = None
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def _bind(self, reference):
+        # A different snapshot makes every cached result stale
+        if reference is not self.reference:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.records = 0
+            self.reference = reference
+
+    def get(self, reference, key):
+        if not self.enabled:
+            return None
+        with self.lock:
+            self._bind(reference)
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, reference, key, result):
+        if not self.enabled:
+            return
+        records = result_records(result)
+        if records > self.max_records:
+            return
+        with self.lock:
+            self._bind(reference)
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, records, result)
+            self.records += records
+            while len(self.entries) > self.max_entries or self.records > self.max_records:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        self.records -= self.entries.pop(key)[1]
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "records": self.records,
+                "max_entries": self.max_entries,
+                "max_records": self.max_records,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
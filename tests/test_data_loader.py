@@ -0,0 +1,40 @@
+import pandas as pd
+from sqlalchemy import create_engine, text
+from data_loader import read_delta, read_table, sync_table, table_version, version_watermark
+
+TABLE = 'ensembl_to_go'
+# As uploader.py bulk-loads it: every row stamped within the same moment
+BULK_LOAD = pd.DataFrame({
+    'ensembl_gene_id': [f'ENSG{i:011d}' for i in range(200) for _ in range(2)],
+    'go_id': [f'GO:{j:07d}' for _ in range(200) for j in range(2)],
+    'updated_at': '2026-01-01 00:00:00',
+    'deleted': False,
+})
+
+
+def bulk_loaded_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reference.db'}")
+    BULK_LOAD.to_sql(TABLE, engine, index=False)
+    return engine
+
+
+def test_sync_with_no_changes_reads_no_rows(tmp_path):
+    engine = bulk_loaded_engine(tmp_path)
+    changed_keys, rows, live_count = read_delta(engine, TABLE, version_watermark(table_version(engine, TABLE)))
+    assert changed_keys == []
+    assert len(rows) == 0
+    assert live_count == len(BULK_LOAD)
+
+
+def test_sync_reads_only_the_changed_keys(tmp_path):
+    engine = bulk_loaded_engine(tmp_path)
+    df, previous_version = read_table(engine, TABLE), table_version(engine, TABLE)
+    with engine.begin() as conn:
+        conn.execute(text(f"UPDATE {TABLE} SET deleted = 1, updated_at = '2026-01-02 00:00:00' "
+                          "WHERE ensembl_gene_id = 'ENSG00000000007' AND go_id = 'GO:0000001'"))
+
+    synced, changed_keys = sync_table(engine, TABLE, df, previous_version, table_version(engine, TABLE))
+    assert changed_keys == ['ENSG00000000007']
+    expected = read_table(engine, TABLE)
+    assert sorted(zip(synced['ensembl_gene_id'].astype(str), synced['go_id'].astype(str))) == \
+        sorted(zip(expected['ensembl_gene_id'].astype(str), expected['go_id'].astype(str)))
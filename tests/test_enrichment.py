@@ -0,0 +1,16 @@
+import numpy as np
+from scipy.stats import hypergeom
+from enrichment import hypergeom_sf
+
+
+def test_hypergeom_sf_matches_scipy():
+    rng = np.random.default_rng(0)
+    for M, N in ((40, 12), (5_000, 100), (60_000, 20_000)):
+        K = rng.integers(1, M // 3, 2_000)
+        mode = np.floor((N + 1) * (K + 1) / (M + 2)).astype(np.int64)
+        # Both tails, the mode itself and the edges of the support
+        k = np.clip(mode + rng.integers(-40, 40, len(K)), 1, np.minimum(K, N))
+        k[:10] = 1
+        k[10:20] = np.minimum(K, N)[10:20]
+        np.testing.assert_allclose(hypergeom_sf(k, M, K, N), hypergeom.sf(k - 1, M, K, N),
+                                   rtol=1e-8, atol=1e-300)
@@ -0,0 +1,62 @@
+import tracemalloc
+import pandas as pd
+from sqlalchemy import create_engine
+from comparison_backends import InMemoryBackend, SqlBackend
+from fast_json import encode
+from reference import ReferenceData
+
+# Two real HGNC symbols that start with 'ENS' but are not Ensembl IDs
+GENES = pd.DataFrame({
+    'ensembl_gene_id': ['ENSG00000143420', 'ENSG00000229819', 'ENSG00000141510'],
+    'gene_symbol': ['ENSA', 'ENSAP1', 'TP53'],
+})
+GO_TERMS = pd.DataFrame({'GO_ID': ['GO:0000001', 'GO:0000002'], 'GO_Term': ['term one', 'term two']})
+ENSEMBL_TO_GO = pd.DataFrame({
+    'ensembl_gene_id': ['ENSG00000143420', 'ENSG00000229819', 'ENSG00000141510'],
+    'go_id': ['GO:0000001', 'GO:0000002', 'GO:0000002'],
+})
+
+
+def build_reference():
+    return ReferenceData.build(GENES, GO_TERMS, ENSEMBL_TO_GO)
+
+
+def test_symbols_starting_with_ens_resolve_through_the_key_index():
+    reference = build_reference()
+    resolution = reference.identifier_index.resolve(['ENSA', 'ENSAP1', 'ENSG00000141510.7', 'ENSBOGUS'],
+                                                    reference.gene_universe)
+    assert reference.gene_universe.gene_ids[resolution.gene_codes].tolist() == \
+        ['ENSG00000141510', 'ENSG00000143420', 'ENSG00000229819']
+    assert resolution.unmapped == ['ENSBOGUS']
+    assert resolution.ambiguous == []
+
+
+def test_sql_backend_resolves_symbols_like_the_in_memory_one(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reference.db'}")
+    for name, df in (('genes', GENES), ('go_terms', GO_TERMS), ('ensembl_to_go', ENSEMBL_TO_GO)):
+        df.to_sql(name, engine, index=False)
+
+    ids_a, ids_b = {'ENSA', 'ENSG00000143420.3', 'NOTAGENE'}, {'TP53', 'ENSAP1'}
+    sql = SqlBackend(engine).compare(ids_a, ids_b)
+    memory = InMemoryBackend(build_reference()).compare(ids_a, ids_b)
+    for section in ('summary', 'go_comparison', 'gene_symbols', 'identifier_resolution'):
+        assert encode(sql[section]) == encode(memory[section]), section
+    assert sql['identifier_resolution']['up_regulated_unmapped'] == ['NOTAGENE']
+    assert sql['go_comparison']['unique_to_down_regulated'] == [{'id': 'GO:0000002', 'term': 'term two'}]
+
+
+def test_oversized_token_is_unmapped_without_sizing_the_arrays():
+    reference = build_reference()
+    oversized = 'A' * 250_000
+    tokens = [oversized, 'TP53'] + [f'GENE{i}' for i in range(3_000)]
+    tracemalloc.start()
+    try:
+        resolution = reference.identifier_index.resolve(tokens, reference.gene_universe)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # A <U250000 array of these tokens would need ~3 GB
+    assert peak < 50_000_000
+    assert reference.gene_universe.gene_ids[resolution.gene_codes].tolist() == ['ENSG00000141510']
+    assert oversized in resolution.unmapped
+    assert len(resolution.unmapped) == 3_001
@@ -0,0 +1,97 @@
+import os
+import pytest
+from sqlalchemy import create_engine, text
+import uploader
+from data_loader import UPDATED_COLUMN, VERSION_TABLE
+from uploader import UploadTable, upload, upload_tables
+
+# Runs against the local Postgres in DATABASE_URL (COPY and transactional DDL
+# have no SQLite stand-in). Only tables prefixed upload_test_ are touched.
+DATABASE_URL = os.environ.get("DATABASE_URL", "")
+pytestmark = pytest.mark.skipif(not DATABASE_URL.startswith("postgresql"),
+                                reason="needs DATABASE_URL pointing at a local Postgres")
+
+GENES, ANNOTATIONS = 'upload_test_genes', 'upload_test_ensembl_to_go'
+TABLES = (GENES, ANNOTATIONS)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(DATABASE_URL)
+    yield engine
+    with engine.begin() as conn:
+        for table in TABLES:
+            for suffix in ('', '_staging', '_retired'):
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}{suffix}"))
+        conn.execute(text(f"DELETE FROM {VERSION_TABLE} WHERE table_name IN :tables"), {"tables": TABLES})
+    engine.dispose()
+
+
+def write_specs(tmp_path, symbol):
+    genes, annotations = tmp_path / 'genes.tsv', tmp_path / 'ensembl_to_go.tsv'
+    genes.write_text(f"ensembl_gene_id\tgene_symbol\nENSG00000141510\t{symbol}\nENSG00000012048\tBRCA1\n")
+    annotations.write_text("ensembl_gene_id\tgo_id\nENSG00000141510\tGO:0000001\nENSG00000012048\tGO:0000002\n")
+    return [
+        UploadTable(GENES, str(genes), (('ensembl_gene_id', 'text'), ('gene_symbol', 'text')),
+                    (('ensembl_gene_id',),)),
+        # The real definition, updated_at trigger included
+        next(spec for spec in upload_tables() if spec.table == 'ensembl_to_go')._replace(
+            table=ANNOTATIONS, path=str(annotations)),
+    ]
+
+
+def symbol(conn):
+    return conn.execute(text(f"SELECT gene_symbol FROM {GENES} WHERE ensembl_gene_id = 'ENSG00000141510'")).scalar()
+
+
+def test_upload_swaps_tables_in(engine, tmp_path):
+    assert upload(engine, write_specs(tmp_path, 'TP53')) == {GENES: 2, ANNOTATIONS: 2}
+    with engine.connect() as conn:
+        assert symbol(conn) == 'TP53'
+        leftovers = conn.execute(text("SELECT COUNT(*) FROM pg_tables WHERE tablename LIKE 'upload_test_%' "
+                                      "AND (tablename LIKE '%_staging' OR tablename LIKE '%_retired')")).scalar()
+        assert leftovers == 0
+        indexes = conn.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+                               {"table": GENES}).scalars().all()
+        assert f"{GENES}_ensembl_gene_id_idx" in indexes
+        versions = dict(conn.execute(text(f"SELECT table_name, version FROM {VERSION_TABLE} "
+                                          "WHERE table_name IN :tables"), {"tables": TABLES}).all())
+        assert set(versions) == set(TABLES)
+    # Unchanged files are skipped
+    assert upload(engine, write_specs(tmp_path, 'TP53')) == {}
+
+
+def test_failed_swap_leaves_every_table_as_it_was(engine, tmp_path, monkeypatch):
+    upload(engine, write_specs(tmp_path, 'TP53'))
+    with engine.connect() as conn:
+        versions = conn.execute(text(f"SELECT table_name, version FROM {VERSION_TABLE} "
+                                     "WHERE table_name IN :tables ORDER BY table_name"), {"tables": TABLES}).all()
+
+    swap_in = uploader.swap_in
+    def swap_then_fail(cursor, spec, version):
+        if spec.table == ANNOTATIONS:
+            raise RuntimeError("swap failed")
+        swap_in(cursor, spec, version)
+    monkeypatch.setattr(uploader, 'swap_in', swap_then_fail)
+
+    with pytest.raises(RuntimeError):
+        upload(engine, write_specs(tmp_path, 'P53'), force=True)
+    with engine.connect() as conn:
+        # The genes swap ran first but was rolled back with the failed one
+        assert symbol(conn) == 'TP53'
+        assert conn.execute(text(f"SELECT table_name, version FROM {VERSION_TABLE} "
+                                 "WHERE table_name IN :tables ORDER BY table_name"),
+                            {"tables": TABLES}).all() == versions
+
+
+def test_update_bumps_updated_at(engine, tmp_path):
+    upload(engine, write_specs(tmp_path, 'TP53'))
+    select = text(f"SELECT {UPDATED_COLUMN} FROM {ANNOTATIONS} WHERE ensembl_gene_id = 'ENSG00000141510'")
+    with engine.connect() as conn:
+        before = conn.execute(select).scalar()
+    with engine.begin() as conn:
+        # Does not set updated_at itself; the trigger must
+        conn.execute(text(f"UPDATE {ANNOTATIONS} SET go_id = 'GO:0000003' "
+                          "WHERE ensembl_gene_id = 'ENSG00000141510'"))
+    with engine.connect() as conn:
+        assert conn.execute(select).scalar() > before
@@ -0,0 +1,202 @@
+import hashlib
+import io
+import os
+import sys
+from typing import NamedTuple
+import pandas as pd
+from data_loader import DELETED_COLUMN, UPDATED_COLUMN, VERSION_TABLE
+from identifiers import SYNONYM_COLUMN
+
+# --- BULK UPLOAD TO POSTGRES ---
+# Runs after data_pipeline.py and fills the tables main.py reads. Each source
+# file is read in chunks and streamed into a fresh `<table>_staging` table with
+# COPY FROM STDIN, then the staging table is indexed and analysed while the live
+# table keeps serving. Once every changed file is staged, one short transaction
+# renames all the staging tables into place and records the files' hashes in
+# `data_versions`; Postgres DDL is transactional, so readers see either the old
+# tables or the new ones, never a half-loaded or half-swapped set. Tables whose
+# file hash matches `data_versions` are skipped (see --force).
+#
+# Renaming swaps the whole table, so grants or row-level security policies set
+# on the old one by hand need re-applying to the new one.
+
+PROCESSED_DATA_DIR = 'processed_data'
+GENE_INFO_PATH = os.path.join('data_factory', 'output', 'human_gene_info.csv')
+CHUNK_ROWS = 200_000
+
+
+class UploadTable(NamedTuple):
+    table: str
+    path: str
+    columns: tuple          # (name, SQL type), in file order after `rename`
+    indexes: tuple = ()     # column tuples, one index each
+    sep: str = '\t'
+    rename: dict = {}
+    extra_columns: str = ''  # server-filled columns appended to the definition
+    touch_updated: bool = False  # bump UPDATED_COLUMN on every UPDATE
+
+
+def processed_path(filename):
+    return os.path.join(PROCESSED_DATA_DIR, filename)
+
+def genes_upload():
+    # The data factory's gene info adds Entrez IDs and aliases to the mart's gene map
+    if os.path.exists(GENE_INFO_PATH):
+        return UploadTable('genes', GENE_INFO_PATH, (
+            ('ensembl_gene_id', 'text'), ('entrezgene_id', 'bigint'),
+            ('gene_symbol', 'text'), (SYNONYM_COLUMN, 'text'),
+        ), (('ensembl_gene_id',), ('gene_symbol',), ('entrezgene_id',)),
+            sep=',', rename={'hgnc_symbol': 'gene_symbol'})
+    return UploadTable('genes', processed_path('gene_map.tsv'), (
+        ('ensembl_gene_id', 'text'), ('gene_symbol', 'text'),
+    ), (('ensembl_gene_id',), ('gene_symbol',)))
+
+def upload_tables():
+    return [
+        genes_upload(),
+        UploadTable('go_terms', processed_path('go_terms.tsv'), (
+            ('GO_ID', 'text'), ('GO_Term', 'text'), ('namespace', 'text'), ('is_obsolete', 'boolean'),
+        ), (('GO_ID',),)),
+        UploadTable('ensembl_to_go', processed_path('ensembl_to_go.tsv'), (
+            ('ensembl_gene_id', 'text'), ('go_id', 'text'),
+        ), (('ensembl_gene_id',), ('go_id',), (UPDATED_COLUMN,)),
+            # Read by data_loader's delta sync
+            extra_columns=f", {UPDATED_COLUMN} timestamptz NOT NULL DEFAULT clock_timestamp(), "
+                          f"{DELETED_COLUMN} boolean NOT NULL DEFAULT false", touch_updated=True),
+        UploadTable('go_parents', processed_path('go_parents.tsv'), (
+            ('go_id', 'text'), ('parent_go_id', 'text'), ('relation', 'text'),
+        ), (('go_id',), ('parent_go_id',))),
+    ]
+
+def quote(name):
+    return f'"{name}"'
+
+def file_version(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return f"sha1:{digest.hexdigest()[:16]}"
+
+def index_name(table, columns):
+    return f"{table}_{'_'.join(columns)}_idx".lower()
+
+def copy_chunks(spec):
+    """Yield ``(buffer, rows)``: the source file as COPY-ready CSV text, CHUNK_ROWS rows at a time."""
+    names = [name for name, _ in spec.columns]
+    header = pd.read_csv(spec.path, sep=spec.sep, nrows=0).columns
+    usecols = [column for column in header if spec.rename.get(column, column) in names]
+    if not usecols:
+        raise ValueError(f"{spec.path} has none of the columns {names}")
+    for chunk in pd.read_csv(spec.path, sep=spec.sep, usecols=usecols, dtype=str,
+                             keep_default_na=False, na_values=[''], chunksize=CHUNK_ROWS):
+        # Columns the file lacks are loaded as NULL
+        chunk = chunk.rename(columns=spec.rename).reindex(columns=names)
+        buffer = io.StringIO()
+        chunk.to_csv(buffer, sep='\t', index=False, header=False)
+        buffer.seek(0)
+        yield buffer, len(chunk)
+
+# Delta sync trusts UPDATED_COLUMN to move on every write, including edits that
+# don't set it themselves. The trigger travels with the table when it is renamed.
+TOUCH_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION touch_{UPDATED_COLUMN}() RETURNS trigger AS $$
+BEGIN
+    NEW.{UPDATED_COLUMN} := clock_timestamp();
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+def load_staging(cursor, spec):
+    staging = f"{spec.table}_staging"
+    definition = ', '.join(f"{quote(name)} {sql_type}" for name, sql_type in spec.columns)
+    cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+    cursor.execute(f"CREATE TABLE {staging} ({definition}{spec.extra_columns})")
+
+    copy = (f"COPY {staging} ({', '.join(quote(name) for name, _ in spec.columns)}) "
+            f"FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '')")
+    rows = 0
+    for buffer, n in copy_chunks(spec):
+        cursor.copy_expert(copy, buffer)
+        rows += n
+
+    # Indexes are built once after the load, which is far cheaper than maintaining them per row
+    for columns in spec.indexes:
+        cursor.execute(f"CREATE INDEX {index_name(staging, columns)} "
+                       f"ON {staging} ({', '.join(quote(column) for column in columns)})")
+    if spec.touch_updated:
+        cursor.execute(TOUCH_FUNCTION)
+        cursor.execute(f"CREATE TRIGGER touch_{UPDATED_COLUMN} BEFORE UPDATE ON {staging} "
+                       f"FOR EACH ROW EXECUTE FUNCTION touch_{UPDATED_COLUMN}()")
+    cursor.execute(f"ANALYZE {staging}")
+    return rows
+
+def swap_in(cursor, spec, version):
+    staging, retired = f"{spec.table}_staging", f"{spec.table}_retired"
+    cursor.execute(f"DROP TABLE IF EXISTS {retired}")
+    cursor.execute(f"ALTER TABLE IF EXISTS {spec.table} RENAME TO {retired}")
+    cursor.execute(f"ALTER TABLE {staging} RENAME TO {spec.table}")
+    cursor.execute(f"DROP TABLE IF EXISTS {retired}")
+    for columns in spec.indexes:
+        cursor.execute(f"ALTER INDEX {index_name(staging, columns)} RENAME TO {index_name(spec.table, columns)}")
+    cursor.execute(f"UPDATE {VERSION_TABLE} SET version = %s WHERE table_name = %s", (version, spec.table))
+    if cursor.rowcount == 0:
+        cursor.execute(f"INSERT INTO {VERSION_TABLE} (table_name, version) VALUES (%s, %s)", (spec.table, version))
+
+def current_versions(cursor):
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (table_name text PRIMARY KEY, version text NOT NULL)")
+    cursor.execute(f"SELECT table_name, version FROM {VERSION_TABLE}")
+    return dict(cursor.fetchall())
+
+def upload(engine, specs, force=False):
+    """Upload every spec whose file changed; returns ``{table: rows}`` for those uploaded."""
+    connection = engine.raw_connection()
+    staged, uploaded = [], {}
+    try:
+        with connection.cursor() as cursor:
+            versions = current_versions(cursor)
+        connection.commit()
+
+        for spec in specs:
+            if not os.path.exists(spec.path):
+                print(f"-> WARNING: {spec.path} not found. Skipping '{spec.table}'.")
+                continue
+            version = file_version(spec.path)
+            if not force and versions.get(spec.table) == version:
+                print(f"-> '{spec.table}' is already at {version}, skipping.")
+                continue
+
+            with connection.cursor() as cursor:
+                rows = load_staging(cursor, spec)
+            connection.commit()
+            staged.append((spec, version, rows))
+            print(f"-> Staged '{spec.table}' ({rows} rows) from {spec.path}.")
+
+        if staged:
+            with connection.cursor() as cursor:
+                # The renames need exclusive locks; give up rather than queue readers behind a long one
+                cursor.execute("SET LOCAL lock_timeout = '10s'")
+                for spec, version, _ in staged:
+                    swap_in(cursor, spec, version)
+            connection.commit()
+        for spec, _, rows in staged:
+            uploaded[spec.table] = rows
+            print(f"✅ Uploaded '{spec.table}' ({rows} rows).")
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return uploaded
+
+
+# --- STANDALONE UPLOADER ---
+# `python uploader.py [--force]` after `python data_pipeline.py`, against the
+# database main.py is configured for (DATABASE_URL for a local Postgres).
+if __name__ == "__main__":
+    from sqlalchemy import create_engine
+    from main import DATABASE_URL
+
+    upload(create_engine(DATABASE_URL), upload_tables(), force='--force' in sys.argv[1:])
+    print("\n--- UPLOAD COMPLETE ---")